@@ -25,13 +25,32 @@ from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import re
+import io
+import threading
 import json
 import os
+import functools
+import time
+
+# Multi-threaded CSV parsing when pyarrow is installed (optional)
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
 
 # LangChain / Groq imports
 from langchain_groq import ChatGroq
 
+# Embeddings for the semantic answer cache (optional - falls back to exact match)
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
 # UI
 import gradio as gr
 
@@ -39,6 +58,33 @@ import gradio as gr
 # SECTION 2: DATA PREPARATION
 # ============================================================================
 
+# Compact dtypes for the log columns: categoricals for low-cardinality strings,
+# smallest unsigned ints that fit for numeric fields (pandas defaults to int64/object)
+ACCESS_DTYPES = {
+    'method': 'category',
+    'endpoint': 'category',
+    'ip_address': 'category',
+    'user_agent': 'category',
+    'department': 'category',
+    'status_code': 'uint16',
+    'response_size': 'uint32',
+    'response_time_ms': 'uint32',
+}
+ERROR_DTYPES = {
+    'log_level': 'category',
+    'error_code': 'category',
+    'client_ip': 'category',
+    'process_id': 'uint32',
+    'thread_id': 'uint32',
+    'line_number': 'uint32',
+    'severity_score': 'uint8',
+}
+
+def read_log_csv(source, dtype):
+    """Read an access/error log CSV (path or buffer) with compact dtypes"""
+    return pd.read_csv(source, dtype=dtype, parse_dates=['timestamp'], engine=CSV_ENGINE)
+
+
 def create_sample_data():
    
     
@@ -59,47 +105,148 @@ def create_sample_data():
 2025-01-06 08:27:45,error,11624,6543,192.168.31.233,PHP_Fatal,PHP Fatal error: Uncaught mysqli_sql_exception: Too many connections,C:\\Apache24\\htdocs\\prg\\swm\\web_syslog_main_select.php,67,9
 2025-01-06 08:45:32,warn,11624,2345,192.168.31.122,AGENT_KILL,Agent termination attempt detected from user_3012,C:\\Apache24\\htdocs\\prg\\swm\\web_agent_kill_attempt.php,23,6"""
     
-    # Save to files
-    with open('access_logs.csv', 'w') as f:
-        f.write(access_logs)
-    
-    with open('error_logs.csv', 'w') as f:
-        f.write(error_logs)
-    
-    return pd.read_csv('access_logs.csv'), pd.read_csv('error_logs.csv')
+    # Parse straight from memory (no temp files on disk)
+    return (
+        read_log_csv(io.StringIO(access_logs), ACCESS_DTYPES),
+        read_log_csv(io.StringIO(error_logs), ERROR_DTYPES),
+    )
 
 # ============================================================================
 # SECTION 3: LOG ANALYSIS FUNCTIONS
 # ============================================================================
 
+# Single pass over user agents: named groups say which tool matched
+UA_TOOL_PATTERN = re.compile(r'(?P<sqlmap>sqlmap)|(?P<curl>curl)|(?P<bot>bot)|(?P<python>python)', re.IGNORECASE)
+SQLI_TOOLS = {'sqlmap', 'curl'}
+BOT_TOOLS = {'bot', 'python', 'curl'}
+
+SLOW_REQUEST_MS = 1000
+
+# User-agent class bit flags (curl counts as both)
+UA_BOT = 1
+UA_SQLI_TOOL = 2
+
+
+def classify_user_agents(user_agents):
+    """Map a categorical user-agent column to per-row int8 UA_* flags"""
+    flags = []
+    for agent in user_agents.cat.categories:
+        tags = {m.lastgroup for m in UA_TOOL_PATTERN.finditer(agent)}
+        flags.append((UA_BOT if tags & BOT_TOOLS else 0) | (UA_SQLI_TOOL if tags & SQLI_TOOLS else 0))
+    # Trailing 0 is picked up by code -1 (missing user agent)
+    return np.array(flags + [0], dtype=np.int8)[user_agents.cat.codes.to_numpy()]
+
+
+def cached_result(method):
+    """
+    Compute an analyzer result once per instance (log data never changes after load).
+    Callers get a deep copy, so formatting a returned table or dict in place
+    can't change what later calls see.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self._results:
+            self._results[method.__name__] = method(self)
+        return copy.deepcopy(self._results[method.__name__])
+    return wrapper
+
+
 class LogAnalyzer:
     """Analyzes logs and detects patterns/anomalies"""
     
     def __init__(self, access_df, error_df):
-        self.access_df = access_df
+        # The scans below read these columns through the .cat accessor;
+        # astype() is a no-op for columns read_log_csv/create_sample_data
+        # already made categorical
+        self.access_df = access_df.astype({
+            'ip_address': 'category',
+            'endpoint': 'category',
+            'user_agent': 'category',
+        })
         self.error_df = error_df
+        self._results = {}
+        self.answer_cache = SemanticCache()
+
+        # Status-code masks computed once and shared by all analyzers
+        status = self.access_df['status_code'].to_numpy()
+        self._is_401 = status == 401
+        self._is_404 = status == 404
+        self._is_4xx = (status >= 400) & (status < 500)
+        self._is_5xx = status >= 500
+
+        # User-agent class flags per row; the regex runs once per distinct agent
+        self._ua_class = classify_user_agents(self.access_df['user_agent'])
+    
+    @functools.cached_property
+    def context_text(self):
+        """Lightweight LLM "context" built from analyzer summaries (serialized once)"""
+        # Independent pandas scans, run concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            summary_future = executor.submit(self.generate_traffic_summary)
+            threats_future = executor.submit(self.detect_security_threats)
+            anomalies_future = executor.submit(self.detect_anomalies)
+        summary = summary_future.result()
+        threats = threats_future.result()
+        anomalies = anomalies_future.result()
+
+        return "\n".join([
+            f"Traffic summary: total_requests={summary['total_requests']}, error_rate={summary['error_rate']}.",
+            f"Top endpoints: {summary['top_endpoints']}",
+            f"Top IPs: {summary['top_ips']}",
+            f"Detected threats: {threats}",
+            f"Detected anomalies: {anomalies}",
+        ])
+    
+    @cached_result
+    def _scan_access_arrays(self):
+        """
+        Single pass over the access log as NumPy code arrays: 401 counts per IP
+        and slow-request count/total/peak per endpoint (indexed by category code).
+        """
+        ip_codes = self.access_df['ip_address'].cat.codes.to_numpy()
+        endpoint_codes = self.access_df['endpoint'].cat.codes.to_numpy()
+        response_times = self.access_df['response_time_ms'].to_numpy()
+        n_ips = len(self.access_df['ip_address'].cat.categories)
+        n_endpoints = len(self.access_df['endpoint'].cat.categories)
+
+        failed = self._is_401 & (ip_codes >= 0)
+        slow = (response_times > SLOW_REQUEST_MS) & (endpoint_codes >= 0)
+        slow_codes = endpoint_codes[slow]
+        slow_times = response_times[slow]
+
+        slow_peak = np.zeros(n_endpoints, dtype=response_times.dtype)
+        np.maximum.at(slow_peak, slow_codes, slow_times)
+
+        return {
+            'ip_failures': np.bincount(ip_codes[failed], minlength=n_ips),
+            'slow_count': np.bincount(slow_codes, minlength=n_endpoints),
+            'slow_total': np.bincount(slow_codes, weights=slow_times, minlength=n_endpoints),
+            'slow_peak': slow_peak,
+            'slow_endpoints': pd.unique(slow_codes),  # first-seen order
+        }
     
+    @cached_result
     def detect_security_threats(self):
         """Detect brute force, SQL injection, bot activity"""
         threats = []
         
         # Brute force detection (multiple 401s from same IP)
-        failed_logins = self.access_df[self.access_df['status_code'] == 401]
-        ip_failures = failed_logins.groupby('ip_address').size()
-        
-        for ip, count in ip_failures.items():
-            if count >= 3:
-                threats.append({
-                    'severity': 'HIGH',
-                    'type': 'Brute Force Attack',
-                    'details': f'{count} failed login attempts from IP {ip}',
-                    'recommendation': f'Block IP {ip} and enable rate limiting'
-                })
+        ip_failures = self._scan_access_arrays()['ip_failures']
+        ips = self.access_df['ip_address'].cat.categories
+        sel = np.flatnonzero(ip_failures >= 3)
+
+        threats.extend(
+            {
+                'severity': 'HIGH',
+                'type': 'Brute Force Attack',
+                'details': f'{ip_failures[i]} failed login attempts from IP {ips[i]}',
+                'recommendation': f'Block IP {ips[i]} and enable rate limiting'
+            }
+            for i in sel
+        )
         
         # SQL injection detection
-        sql_patterns = self.access_df[
-            self.access_df['user_agent'].str.contains('sqlmap|curl', case=False, na=False)
-        ]
+        sql_patterns = self.access_df[(self._ua_class & UA_SQLI_TOOL) != 0]
         
         if len(sql_patterns) > 0:
             for _, row in sql_patterns.iterrows():
@@ -111,79 +258,78 @@ class LogAnalyzer:
                 })
         
         # Bot detection
-        bot_traffic = self.access_df[
-            self.access_df['user_agent'].str.contains('bot|python|curl', case=False, na=False)
-        ]
+        bot_count = int(((self._ua_class & UA_BOT) != 0).sum())
         
-        if len(bot_traffic) > 0:
+        if bot_count > 0:
             threats.append({
                 'severity': 'LOW',
                 'type': 'Automated Bot Activity',
-                'details': f'{len(bot_traffic)} requests from automated tools',
+                'details': f'{bot_count} requests from automated tools',
                 'recommendation': 'Implement CAPTCHA on sensitive endpoints'
             })
         
         return threats
     
+    @cached_result
     def analyze_errors(self):
         """Analyze 4xx and 5xx errors"""
         errors = []
         
         # 500 errors
-        server_errors = self.access_df[self.access_df['status_code'] >= 500]
-        if len(server_errors) > 0:
-            for endpoint in server_errors['endpoint'].unique():
-                count = len(server_errors[server_errors['endpoint'] == endpoint])
-                errors.append({
-                    'severity': 'HIGH',
-                    'error_type': '500 Internal Server Error',
-                    'endpoint': endpoint,
-                    'count': count,
-                    'recommendation': 'Check PHP error logs for specific cause'
-                })
+        server_errors = self.access_df[self._is_5xx]
+        endpoint_counts = server_errors.groupby('endpoint', sort=False, observed=True).size()
+        for endpoint, count in endpoint_counts.items():
+            errors.append({
+                'severity': 'HIGH',
+                'error_type': '500 Internal Server Error',
+                'endpoint': endpoint,
+                'count': int(count),
+                'recommendation': 'Check PHP error logs for specific cause'
+            })
         
         # 404 errors
-        not_found = self.access_df[self.access_df['status_code'] == 404]
-        if len(not_found) > 0:
+        not_found_count = int(self._is_404.sum())
+        if not_found_count > 0:
             errors.append({
                 'severity': 'MEDIUM',
                 'error_type': '404 Not Found',
-                'count': len(not_found),
+                'count': not_found_count,
                 'recommendation': 'Fix broken links or implement proper routing'
             })
         
         return errors
     
+    @cached_result
     def detect_performance_issues(self):
         """Identify slow endpoints"""
         issues = []
         
         # Find slow endpoints (>1000ms)
-        slow_requests = self.access_df[self.access_df['response_time_ms'] > 1000]
+        scan = self._scan_access_arrays()
+        endpoints = self.access_df['endpoint'].cat.categories
         
-        if len(slow_requests) > 0:
-            for endpoint in slow_requests['endpoint'].unique():
-                endpoint_data = slow_requests[slow_requests['endpoint'] == endpoint]
-                avg_time = endpoint_data['response_time_ms'].mean()
-                max_time = endpoint_data['response_time_ms'].max()
-                
-                issues.append({
-                    'severity': 'HIGH' if max_time > 3000 else 'MEDIUM',
-                    'endpoint': endpoint,
-                    'avg_response_time': f'{avg_time:.0f}ms',
-                    'peak_response_time': f'{max_time:.0f}ms',
-                    'optimization': 'Add database indexing or implement caching'
-                })
+        for i in scan['slow_endpoints']:
+            avg_time = scan['slow_total'][i] / scan['slow_count'][i]
+            max_time = scan['slow_peak'][i]
+            endpoint = endpoints[i]
+            issues.append({
+                'severity': 'HIGH' if max_time > 3000 else 'MEDIUM',
+                'endpoint': endpoint,
+                'avg_response_time': f'{avg_time:.0f}ms',
+                'peak_response_time': f'{max_time:.0f}ms',
+                'optimization': 'Add database indexing or implement caching'
+            })
         
         return issues
     
+    @cached_result
     def generate_traffic_summary(self):
         """Generate traffic overview"""
         total_requests = len(self.access_df)
-        error_rate = len(self.access_df[self.access_df['status_code'] >= 400]) / total_requests * 100
+        error_rate = int((self._is_4xx | self._is_5xx).sum()) / total_requests * 100
         
-        top_endpoints = self.access_df['endpoint'].value_counts().head(5)
-        top_ips = self.access_df['ip_address'].value_counts().head(5)
+        top_endpoints = self.access_df['endpoint'].value_counts(sort=False).nlargest(5)
+        top_ips = self.access_df['ip_address'].value_counts(sort=False).nlargest(5)
         
         return {
             'total_requests': total_requests,
@@ -192,6 +338,7 @@ class LogAnalyzer:
             'top_ips': top_ips.to_dict()
         }
     
+    @cached_result
     def detect_anomalies(self):
         """Detect unusual patterns"""
         anomalies = []
@@ -204,7 +351,7 @@ class LogAnalyzer:
                 'type': error['error_code'],
                 'severity': 'CRITICAL',
                 'message': error['error_message'],
-                'timestamp': error['timestamp']
+                'timestamp': str(error['timestamp'])
             })
         
         # Agent kill attempts
@@ -223,9 +370,133 @@ class LogAnalyzer:
 # SECTION 4: LLM + CHATBOT INTERFACE (no external vector DB)
 # ============================================================================
 
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+LLM_MODEL = "llama-3.3-70b-versatile"
+
+PROMPT_TEMPLATE = """You are an AI security analyst for a watermarking and DLP (Data Leak Prevention) system.
+
+Context from logs:
+{context}
+
+Question: {query}
+
+Provide a detailed, actionable answer based on the log data. Include:
+1. Summary of findings
+2. Severity assessment
+3. Specific recommendations
+4. Technical details when relevant"""
+
+# One Groq client per API key, reused across queries (keeps its HTTP session warm)
+_LLM_CACHE = {}
+
+
+def get_llm(api_key):
+    """Get or create the ChatGroq client for an API key"""
+    llm = _LLM_CACHE.get(api_key)
+    if llm is None:
+        llm = ChatGroq(api_key=api_key, model_name=LLM_MODEL, temperature=0.1)
+        _LLM_CACHE[api_key] = llm
+    return llm
+
+
+@functools.lru_cache(maxsize=1)
+def get_embedder():
+    """Load the sentence-transformers model once; None if unavailable"""
+    if SentenceTransformer is None:
+        return None
+    try:
+        return SentenceTransformer(EMBEDDING_MODEL)
+    except Exception as e:
+        print(f"⚠️  Could not load embedding model {EMBEDDING_MODEL} ({e}); "
+              "the answer cache falls back to exact matches")
+        return None
+
+
+# Tokens that name a specific thing: IPs, numbers and IDs such as user_5012 or evt-1001
+ENTITY_PATTERN = re.compile(r'[\w.:-]*\d[\w.:-]*')
+
+
+def query_entities(query):
+    """Set of entity tokens in a question (compared exactly by SemanticCache)"""
+    return frozenset(token.strip('.:-') for token in ENTITY_PATTERN.findall(query.lower()))
+
+
+class SemanticCache:
+    """
+    In-process cache of LLM answers keyed by question similarity.
+    Near-duplicate questions ("show brute force" vs "show all brute force
+    attempts") reuse a previous answer instead of another Groq round trip.
+
+    Similar wording is not enough for a hit: both questions must mention the
+    same IPs, numbers and IDs, so "errors for user_5012" never serves the
+    answer cached for user_3012.
+
+    Usage: key = cache.key(query); cache.get(key) ... cache.put(key, answer)
+    (the query is embedded once per lookup).
+    """
+
+    def __init__(self, threshold=0.92, ttl_seconds=3600):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._entries = []  # (created_at, key, answer); see key()
+        self._lock = threading.Lock()  # Gradio runs handlers concurrently
+
+    def key(self, query):
+        """(unit vector or normalized text, entity tokens) for a question"""
+        embedder = get_embedder()
+        if embedder is None:
+            text_key = " ".join(query.lower().split())
+        else:
+            text_key = embedder.encode(query, normalize_embeddings=True)
+        return text_key, query_entities(query)
+
+    def _evict_expired(self):
+        """Drop entries older than ttl_seconds (caller holds the lock)"""
+        cutoff = time.time() - self.ttl_seconds
+        self._entries = [e for e in self._entries if e[0] >= cutoff]
+
+    def get(self, key):
+        """Return a cached answer for a similar question with the same entities, or None"""
+        text_key, entities = key
+        with self._lock:
+            self._evict_expired()
+            candidates = [(k, answer) for _, (k, e), answer in self._entries if e == entities]
+        if not candidates:
+            return None
+
+        if isinstance(text_key, str):
+            return next((answer for k, answer in candidates if k == text_key), None)
+
+        sims = np.stack([k for k, _ in candidates]) @ text_key
+        best = int(sims.argmax())
+        return candidates[best][1] if sims[best] >= self.threshold else None
+
+    def put(self, key, answer):
+        with self._lock:
+            self._entries.append((time.time(), key, answer))
+
+
 def create_ui(analyzer, default_api_key=None):
     """Create Gradio UI"""
     
+    def stream_answer(query, api_key):
+        """Answer a free-text question with Groq, yielding the answer as it grows"""
+        cache_key = analyzer.answer_cache.key(query)
+        cached = analyzer.answer_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        llm = get_llm(api_key)
+        prompt = PROMPT_TEMPLATE.format(context=analyzer.context_text, query=query)
+
+        answer = ""
+        for chunk in llm.stream(prompt):
+            # langchain ChatGroq yields message chunks; handle both message and string cases
+            answer += getattr(chunk, "content", str(chunk))
+            yield answer
+        analyzer.answer_cache.put(cache_key, answer)
+    
     def handle_query(query, api_key):
         """Process user query"""
         if not api_key:
@@ -235,94 +506,81 @@ def create_ui(analyzer, default_api_key=None):
             # Handle predefined prompts
             if query == "security_threats":
                 threats = analyzer.detect_security_threats()
-                response = "🔐 **Security Threat Detection**\n\n"
+                parts = ["🔐 **Security Threat Detection**\n\n"]
                 for threat in threats:
-                    response += f"**[{threat['severity']}] {threat['type']}**\n"
-                    response += f"- {threat['details']}\n"
-                    response += f"- *Recommendation:* {threat['recommendation']}\n\n"
-                return response
+                    parts.append(
+                        f"**[{threat['severity']}] {threat['type']}**\n"
+                        f"- {threat['details']}\n"
+                        f"- *Recommendation:* {threat['recommendation']}\n\n"
+                    )
+                return "".join(parts)
             
             elif query == "error_analysis":
                 errors = analyzer.analyze_errors()
-                response = "⚠️ **Error Analysis (4xx/5xx)**\n\n"
+                parts = ["⚠️ **Error Analysis (4xx/5xx)**\n\n"]
                 for error in errors:
-                    response += f"**[{error['severity']}] {error['error_type']}**\n"
-                    response += f"- Count: {error.get('count', 'N/A')}\n"
-                    response += f"- *Fix:* {error['recommendation']}\n\n"
-                return response
+                    parts.append(
+                        f"**[{error['severity']}] {error['error_type']}**\n"
+                        f"- Count: {error.get('count', 'N/A')}\n"
+                        f"- *Fix:* {error['recommendation']}\n\n"
+                    )
+                return "".join(parts)
             
             elif query == "performance_issues":
                 issues = analyzer.detect_performance_issues()
-                response = "⚡ **Performance Analysis**\n\n"
+                parts = ["⚡ **Performance Analysis**\n\n"]
                 for issue in issues:
-                    response += f"**[{issue['severity']}] {issue['endpoint']}**\n"
-                    response += f"- Avg: {issue['avg_response_time']}, Peak: {issue['peak_response_time']}\n"
-                    response += f"- *Optimization:* {issue['optimization']}\n\n"
-                return response
+                    parts.append(
+                        f"**[{issue['severity']}] {issue['endpoint']}**\n"
+                        f"- Avg: {issue['avg_response_time']}, Peak: {issue['peak_response_time']}\n"
+                        f"- *Optimization:* {issue['optimization']}\n\n"
+                    )
+                return "".join(parts)
             
             elif query == "traffic_summary":
                 summary = analyzer.generate_traffic_summary()
-                response = "📈 **Traffic Summary**\n\n"
-                response += f"- Total Requests: {summary['total_requests']}\n"
-                response += f"- Error Rate: {summary['error_rate']}\n"
-                response += f"\n**Top Endpoints:**\n"
+                parts = [
+                    "📈 **Traffic Summary**\n\n",
+                    f"- Total Requests: {summary['total_requests']}\n",
+                    f"- Error Rate: {summary['error_rate']}\n",
+                    "\n**Top Endpoints:**\n",
+                ]
                 for endpoint, count in list(summary['top_endpoints'].items())[:3]:
-                    response += f"- {endpoint}: {count} requests\n"
-                return response
+                    parts.append(f"- {endpoint}: {count} requests\n")
+                return "".join(parts)
             
             elif query == "anomaly_detection":
                 anomalies = analyzer.detect_anomalies()
-                response = "🔎 **Anomaly Detection**\n\n"
+                parts = ["🔎 **Anomaly Detection**\n\n"]
                 for anomaly in anomalies:
-                    response += f"**[{anomaly['severity']}] {anomaly['type']}**\n"
-                    response += f"- {anomaly['message']}\n"
-                    response += f"- Time: {anomaly['timestamp']}\n\n"
-                return response
+                    parts.append(
+                        f"**[{anomaly['severity']}] {anomaly['type']}**\n"
+                        f"- {anomaly['message']}\n"
+                        f"- Time: {anomaly['timestamp']}\n\n"
+                    )
+                return "".join(parts)
             
             # Natural language query using Groq directly
             else:
-                llm = ChatGroq(
-                    api_key=api_key,
-                    model_name="llama-3.3-70b-versatile",
-                    temperature=0.1,
-                )
-
-                # Lightweight "context" built from analyzer summaries
-                summary = analyzer.generate_traffic_summary()
-                threats = analyzer.detect_security_threats()
-                anomalies = analyzer.detect_anomalies()
-
-                context_parts = [
-                    f"Traffic summary: total_requests={summary['total_requests']}, error_rate={summary['error_rate']}.",
-                    f"Top endpoints: {summary['top_endpoints']}",
-                    f"Top IPs: {summary['top_ips']}",
-                    f"Detected threats: {threats}",
-                    f"Detected anomalies: {anomalies}",
-                ]
-                context_text = "\n".join(context_parts)
-
-                prompt = f"""
-You are an AI security analyst for a watermarking and DLP (Data Leak Prevention) system.
-
-Context from logs:
-{context_text}
-
-Question: {query}
-
-Provide a detailed, actionable answer based on the log data. Include:
-1. Summary of findings
-2. Severity assessment
-3. Specific recommendations
-4. Technical details when relevant
-                """.strip()
-
-                response = llm.invoke(prompt)
-                # langchain ChatGroq returns a BaseMessage; handle both message and string cases
-                return getattr(response, "content", str(response))
+                answer = ""
+                for answer in stream_answer(query, api_key):
+                    pass
+                return answer
         
         except Exception as e:
             return f"❌ Error: {str(e)}\n\nMake sure your Groq API key is valid."
     
+    def handle_query_stream(query, api_key):
+        """Process user query, streaming free-text answers into the UI"""
+        if not api_key or query in dict(prompts).values():
+            yield handle_query(query, api_key)
+            return
+        
+        try:
+            yield from stream_answer(query, api_key)
+        except Exception as e:
+            yield f"❌ Error: {str(e)}\n\nMake sure your Groq API key is valid."
+    
     # Predefined prompts
     prompts = [
         ("🔐 Detect Security Threats", "security_threats"),
@@ -367,7 +625,7 @@ Provide a detailed, actionable answer based on the log data. Include:
         output = gr.Textbox(label="Answer", lines=15)
         
         submit_btn.click(
-            fn=handle_query,
+            fn=handle_query_stream,
             inputs=[query_input, api_key_input],
             outputs=output
         )
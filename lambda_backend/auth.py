@@ -19,28 +19,6 @@ from logger import get_logger
 logger = get_logger()
 
 
-def constant_time_compare(a: str, b: str) -> bool:
-    """
-    Constant-time string comparison to prevent timing attacks.
-    
-    Uses HMAC comparison which is safe against timing attacks.
-    This prevents attackers from learning valid API keys through
-    timing differences in comparison operations.
-    
-    Args:
-        a: First string
-        b: Second string
-        
-    Returns:
-        True if strings match, False otherwise
-    """
-    if len(a) != len(b):
-        return False
-    
-    # Use HMAC comparison for constant-time operation
-    return hmac.compare_digest(a.encode('utf-8'), b.encode('utf-8'))
-
-
 def validate_api_key(api_key: Optional[str]) -> bool:
     """
     Validate API key against configured keys.
@@ -60,18 +38,20 @@ def validate_api_key(api_key: Optional[str]) -> bool:
         logger.warning('API request missing x-api-key header')
         return False
     
-    # Get valid keys from config
-    valid_keys = Config.get_api_keys()
+    # Valid keys are pre-encoded to bytes at config load
+    valid_keys = Config.API_KEY_BYTES
     
     if not valid_keys:
         logger.error('No API keys configured in environment')
         return False
     
-    # Check against all valid keys (supports rotation)
-    for valid_key in valid_keys:
-        if constant_time_compare(api_key, valid_key):
-            logger.debug('API key validated successfully')
-            return True
+    # Check against all valid keys (supports rotation).
+    # hmac.compare_digest is constant-time and safe on length mismatch,
+    # so attackers can't learn valid keys from timing differences.
+    key_bytes = api_key.encode('utf-8')
+    if any(hmac.compare_digest(key_bytes, valid_key) for valid_key in valid_keys):
+        logger.debug('API key validated successfully')
+        return True
     
     # Log failed attempt (but don't leak which key was tried)
     logger.warning('Invalid API key provided')
@@ -19,23 +19,38 @@ class Config:
     
     # Database Configuration (from Lambda environment variables)
     DB_HOST: str = os.getenv('DB_HOST', '')
+    DB_READ_HOST: str = os.getenv('DB_READ_HOST', '') or DB_HOST  # Read replica endpoint for SELECTs (defaults to DB_HOST)
     DB_PORT: int = int(os.getenv('DB_PORT', '3306'))
     DB_NAME: str = os.getenv('DB_NAME', '')
     DB_USER: str = os.getenv('DB_USER', '')
     DB_PASSWORD: str = os.getenv('DB_PASSWORD', '')
+    DB_SSL_CA: str = os.getenv('DB_SSL_CA', '')  # CA bundle path; enables TLS when set (e.g. RDS global bundle)
     
     # API Key Configuration (comma-separated list for key rotation)
     # Format: "key1,key2,key3" - supports multiple valid keys
     API_KEYS_STR: str = os.getenv('API_KEYS', '')
     
+    # Same keys pre-encoded once at cold start (auth compares bytes per request);
+    # filled from get_api_keys() below the class
+    API_KEY_BYTES: List[bytes] = []
+    
     # Request Limits
     MAX_PAYLOAD_SIZE: int = int(os.getenv('MAX_PAYLOAD_SIZE', '1048576'))  # 1MB default
     MAX_QUERY_LIMIT: int = int(os.getenv('MAX_QUERY_LIMIT', '1000'))  # Max rows per query
+    MAX_BATCH_SIZE: int = int(os.getenv('MAX_BATCH_SIZE', '500'))  # Max rows per batch insert
+    
+    # Read Result Cache (per warm container)
+    RESULT_CACHE_SIZE: int = int(os.getenv('RESULT_CACHE_SIZE', '256'))  # 0 disables caching
+    RESULT_CACHE_CLEAR_ON_WRITE: bool = os.getenv('RESULT_CACHE_CLEAR_ON_WRITE', 'true').lower() == 'true'
     
     # Database Connection Pool Settings
     DB_CONNECTION_TIMEOUT: int = int(os.getenv('DB_CONNECTION_TIMEOUT', '5'))  # seconds
     DB_QUERY_TIMEOUT: int = int(os.getenv('DB_QUERY_TIMEOUT', '30'))  # seconds
     DB_MAX_RETRIES: int = int(os.getenv('DB_MAX_RETRIES', '3'))
+    DB_PING_INTERVAL: int = int(os.getenv('DB_PING_INTERVAL', '60'))  # seconds idle before re-ping
+    DB_POOL_SIZE: int = int(os.getenv('DB_POOL_SIZE', '4'))  # Warm write connections per container
+    DB_READ_POOL_SIZE: int = int(os.getenv('DB_READ_POOL_SIZE', '2'))  # Warm read-only connections per container
+    DB_KEEPALIVE_IDLE: int = int(os.getenv('DB_KEEPALIVE_IDLE', '60'))  # seconds idle before TCP keepalive probes
     
     # Logging Configuration
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
@@ -87,6 +102,10 @@ class Config:
                 f"Missing required environment variables: {', '.join(missing)}. "
                 "Set these in Lambda configuration or use AWS Secrets Manager."
             )
+        
+        # TLS CA bundle must be packaged with the function (see DEPLOYMENT.md)
+        if cls.DB_SSL_CA and not os.path.isfile(cls.DB_SSL_CA):
+            raise ValueError(f"DB_SSL_CA file not found: {cls.DB_SSL_CA}")
     
     @classmethod
     def get_db_config(cls) -> dict:
@@ -106,6 +125,9 @@ class Config:
         }
 
 
+Config.API_KEY_BYTES = [key.encode('utf-8') for key in Config.get_api_keys()]
+
+
 # Optional: AWS Secrets Manager integration
 # Uncomment and implement if you want to use Secrets Manager instead of env vars
 """
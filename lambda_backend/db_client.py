@@ -16,14 +16,144 @@ Security Notes:
 """
 
 import pymysql
-from typing import Any, Dict, List, Optional, Tuple
-from contextlib import contextmanager
+import queue
+import socket
+import ssl
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import ExitStack, contextmanager
+import functools
 import time
 from config import Config
 from logger import get_logger
 
 logger = get_logger()
 
+# MySQL client error codes meaning the server connection is gone
+# (2006: server has gone away, 2013: lost connection during query, 2055: lost connection)
+_CONNECTION_LOST_CODES = {2006, 2013, 2055}
+
+# TCP keepalive probe interval/count once DB_KEEPALIVE_IDLE has passed; keeps
+# NAT/firewall state alive so pooled connections aren't silently dropped
+_KEEPALIVE_INTERVAL = 15
+_KEEPALIVE_COUNT = 4
+
+
+def _create_ssl_context() -> Optional[ssl.SSLContext]:
+    """
+    Build the TLS context shared by every pooled connection.
+    
+    Returns:
+        Verifying client context for Config.DB_SSL_CA, or None if TLS is not configured
+    """
+    if not Config.DB_SSL_CA:
+        return None
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)  # check_hostname + CERT_REQUIRED
+    context.load_verify_locations(cafile=Config.DB_SSL_CA)
+    return context
+
+
+def _enable_keepalive(connection: pymysql.Connection):
+    """Turn on TCP keepalive for a connection's socket (tuning options are Linux-only)"""
+    sock = connection._sock
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, Config.DB_KEEPALIVE_IDLE)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, _KEEPALIVE_INTERVAL)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, _KEEPALIVE_COUNT)
+
+
+def _is_connection_lost(error: Exception) -> bool:
+    """True if a pymysql error means the connection itself is unusable"""
+    if isinstance(error, pymysql.err.InterfaceError):
+        return True
+    return isinstance(error, pymysql.err.OperationalError) and bool(error.args) and error.args[0] in _CONNECTION_LOST_CODES
+
+
+def _retry_on_disconnect(method):
+    """
+    Retry a read once on a fresh connection if the pooled one went stale.
+    
+    Replaces pinging before every query: a dead socket raises on first use,
+    the pool drops that connection, and we re-run the statement exactly once.
+    
+    Only for SELECTs. A lost connection (2013, InterfaceError) can surface
+    after the server already applied a write, so re-running it could insert
+    duplicates; write connections are instead checked (pinged when idle and
+    reopened if dead) before the statement is sent, in _get_connection.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+            if not _is_connection_lost(e):
+                raise
+            logger.warning('Database connection lost, reconnecting', error_type=type(e).__name__)
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class _PooledConnection:
+    """Pool slot: one lazily opened connection plus its reusable read cursor"""
+    
+    __slots__ = ('read_only', 'connection', 'read_cursor', 'last_used')
+    
+    def __init__(self, read_only: bool = False):
+        self.read_only = read_only
+        self.connection: Optional[pymysql.Connection] = None
+        self.read_cursor: Optional[pymysql.cursors.Cursor] = None
+        self.last_used: float = 0
+    
+    def reset(self):
+        """Close the connection (if any) so the slot reconnects on next use"""
+        if self.connection is not None:
+            try:
+                self.connection.close()
+                logger.info('Database connection closed')
+            except Exception:
+                pass  # Socket already dead
+        self.connection = None
+        self.read_cursor = None
+
+
+class RowStream:
+    """
+    Rows of an unbuffered SELECT, read off the socket one at a time as the
+    stream is iterated (see DatabaseClient.execute_query_iter).
+    
+    The pooled connection stays checked out until the rows are exhausted or
+    close() is called; close() drains unread rows and returns it to the pool.
+    """
+    
+    __slots__ = ('_cursor', '_slot', '_release')
+    
+    def __init__(self, cursor: pymysql.cursors.SSDictCursor, slot: _PooledConnection, release: ExitStack):
+        self._cursor = cursor
+        self._slot = slot
+        self._release = release
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self
+    
+    def __next__(self) -> Dict[str, Any]:
+        try:
+            row = self._cursor.fetchone()
+        except BaseException:
+            # Lets _checkout reset the slot if the connection was lost mid-stream
+            self._release.__exit__(*sys.exc_info())
+            raise
+        if row is None:
+            self._slot.last_used = time.time()
+            self.close()
+            raise StopIteration
+        return row
+    
+    def close(self):
+        """Drain any unread rows and give the connection back (idempotent)"""
+        self._release.close()
+
 
 class DatabaseClient:
     """
@@ -34,41 +164,49 @@ class DatabaseClient:
     - Connection reuse for Lambda container reuse
     - Timeout configuration
     - Safe error handling (never leaks DB structure)
+    
+    Holds pools of connections, opened lazily on first use, so concurrent
+    callers in one container don't serialize on a single socket. SELECTs use
+    a pool of DB_READ_POOL_SIZE READ ONLY sessions (DB_READ_HOST), writes a
+    pool of DB_POOL_SIZE read-write sessions (DB_HOST); a container holds at
+    most the sum of the two.
     """
     
     def __init__(self):
-        self._connection: Optional[pymysql.Connection] = None
-        self._last_used: float = 0
         self._connection_timeout = Config.DB_CONNECTION_TIMEOUT
         self._query_timeout = Config.DB_QUERY_TIMEOUT
+        self._ping_interval = Config.DB_PING_INTERVAL
+        # Built with the client (first DB use), not at import, so a bad CA
+        # bundle fails the request instead of the module import
+        self._ssl_context = _create_ssl_context()
+        # LIFO: the most recently used (warmest) connection is handed out first
+        self._pool: queue.LifoQueue = queue.LifoQueue(maxsize=Config.DB_POOL_SIZE)
+        for _ in range(Config.DB_POOL_SIZE):
+            self._pool.put(_PooledConnection())
+        self._ro_pool: queue.LifoQueue = queue.LifoQueue(maxsize=Config.DB_READ_POOL_SIZE)
+        for _ in range(Config.DB_READ_POOL_SIZE):
+            self._ro_pool.put(_PooledConnection(read_only=True))
+        # Runs independent SELECTs concurrently, one read-only connection each
+        self._executor = ThreadPoolExecutor(max_workers=Config.DB_READ_POOL_SIZE)
     
-    def _get_connection(self) -> pymysql.Connection:
+    def _connect(self, read_only: bool = False) -> pymysql.Connection:
         """
-        Get or create database connection.
-        Reuses connection if still valid (Lambda container reuse).
+        Open a new database connection.
         
+        Args:
+            read_only: Open a READ ONLY session on DB_READ_HOST
+            
         Returns:
             Database connection
             
         Raises:
             Exception: If connection cannot be established
         """
-        # Reuse connection if it exists and is recent (< 5 minutes)
-        if self._connection is not None:
-            try:
-                # Test connection
-                self._connection.ping(reconnect=False)
-                return self._connection
-            except:
-                # Connection is dead, create new one
-                self._connection = None
-        
-        # Create new connection
         try:
             logger.info('Creating new database connection')
             
-            self._connection = pymysql.connect(
-                host=Config.DB_HOST,
+            connection = pymysql.connect(
+                host=Config.DB_READ_HOST if read_only else Config.DB_HOST,
                 port=Config.DB_PORT,
                 user=Config.DB_USER,
                 password=Config.DB_PASSWORD,
@@ -77,41 +215,136 @@ class DatabaseClient:
                 read_timeout=self._query_timeout,
                 write_timeout=self._query_timeout,
                 charset='utf8mb4',
+                ssl=self._ssl_context,
                 cursorclass=pymysql.cursors.DictCursor,
-                autocommit=False  # Use transactions explicitly
+                # Read sessions run SELECTs without opening a transaction (no
+                # COMMIT round-trip); write sessions commit or roll back
+                # explicitly in _get_write_cursor
+                autocommit=read_only,
+                # Read sessions skip write bookkeeping and can't modify data
+                init_command='SET SESSION TRANSACTION READ ONLY' if read_only else None
             )
             
-            self._last_used = time.time()
+            _enable_keepalive(connection)
+            
             logger.info('Database connection established')
             
-            return self._connection
+            return connection
         
         except Exception as e:
-            logger.error('Failed to connect to database', error=e)
+            logger.error('Failed to connect to database', error=e, capture_stack=False)
             raise
     
+    def _get_connection(self, slot: _PooledConnection) -> pymysql.Connection:
+        """
+        Get or create the database connection held by a pool slot.
+        Reuses connection if still valid (Lambda container reuse).
+        
+        Recently used connections are returned without a ping round-trip;
+        only connections idle longer than DB_PING_INTERVAL are pinged.
+        
+        Args:
+            slot: Checked-out pool slot
+            
+        Returns:
+            Database connection
+            
+        Raises:
+            Exception: If connection cannot be established
+        """
+        # Reuse connection if it exists and was used recently
+        if slot.connection is not None:
+            if time.time() - slot.last_used < self._ping_interval:
+                return slot.connection
+            try:
+                # Idle for a while - test connection
+                slot.connection.ping(reconnect=False)
+                return slot.connection
+            except Exception:
+                # Connection is dead, create new one
+                slot.reset()
+        
+        slot.connection = self._connect(slot.read_only)
+        slot.last_used = time.time()
+        return slot.connection
+    
     @contextmanager
-    def _get_cursor(self):
+    def _checkout(self, read_only: bool = False):
         """
-        Context manager for database cursor.
-        Ensures proper cleanup and transaction handling.
+        Borrow a pool slot for the duration of the block.
+        Slots whose connection was lost are reset before going back to the pool.
         
+        Args:
+            read_only: Borrow from the read-only pool
+            
         Yields:
-            Database cursor
+            Pool slot
+            
+        Raises:
+            RuntimeError: If no connection frees up within DB_CONNECTION_TIMEOUT
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        pool = self._ro_pool if read_only else self._pool
+        try:
+            slot = pool.get(timeout=self._connection_timeout)
+        except queue.Empty:
+            logger.error('Database connection pool exhausted')
+            raise RuntimeError('Database connection pool exhausted')
         
         try:
-            yield cursor
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            logger.error('Database transaction rolled back', error=e)
+            yield slot
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError) as e:
+            if _is_connection_lost(e):
+                slot.reset()
             raise
         finally:
-            cursor.close()
+            pool.put(slot)
+    
+    @contextmanager
+    def _get_read_cursor(self):
+        """
+        Context manager for read-only queries.
+        Runs on a READ ONLY session, reuses one cursor per pooled connection
+        and skips commit/rollback (autocommit connection, nothing to commit for a SELECT).
+        
+        Yields:
+            Database cursor
+        """
+        with self._checkout(read_only=True) as slot:
+            conn = self._get_connection(slot)
+            if slot.read_cursor is None:
+                slot.read_cursor = conn.cursor()
+            
+            yield slot.read_cursor
+            slot.last_used = time.time()
+    
+    @contextmanager
+    def _get_write_cursor(self):
+        """
+        Context manager for database cursor.
+        Ensures proper cleanup and transaction handling.
+        
+        Yields:
+            Database cursor
+        """
+        with self._checkout() as slot:
+            conn = self._get_connection(slot)
+            cursor = conn.cursor()
+            
+            try:
+                yield cursor
+                conn.commit()
+                slot.last_used = time.time()
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass  # Connection already gone; nothing to roll back
+                logger.error('Database transaction rolled back', error=e, capture_stack=False)
+                raise
+            finally:
+                cursor.close()
     
+    @_retry_on_disconnect
     def execute_query(
         self,
         query: str,
@@ -134,18 +367,119 @@ class DatabaseClient:
         Raises:
             Exception: If query fails
         """
-        with self._get_cursor() as cursor:
-            logger.debug(f'Executing query: {query[:100]}...', params_count=len(params) if params else 0)
+        with self._get_read_cursor() as cursor:
+            logger.debug('Executing query: %.100s...', query, params_count=len(params) if params else 0)
             
             cursor.execute(query, params)
             
             if fetch:
                 results = cursor.fetchall()
-                logger.debug(f'Query returned {len(results)} rows')
+                logger.debug('Query returned %d rows', len(results))
                 return results
             else:
                 return []
     
+    @_retry_on_disconnect
+    def execute_query_rows(
+        self,
+        query: str,
+        params: Optional[Tuple] = None
+    ) -> Tuple[Tuple[str, ...], List[Tuple]]:
+        """
+        Execute a SELECT query and return plain tuples instead of dicts.
+        
+        For callers that reshape every row anyway: skips the per-row dict
+        DictCursor would build, rows are read by position.
+        
+        Args:
+            query: SQL query with %s placeholders
+            params: Tuple of parameters to substitute
+            
+        Returns:
+            Tuple of (column names, list of row tuples)
+            
+        Raises:
+            Exception: If query fails
+        """
+        with self._checkout(read_only=True) as slot:
+            conn = self._get_connection(slot)
+            with conn.cursor(pymysql.cursors.Cursor) as cursor:
+                logger.debug('Executing query: %.100s...', query, params_count=len(params) if params else 0)
+                
+                cursor.execute(query, params)
+                columns = tuple(column[0] for column in cursor.description or ())
+                rows = list(cursor.fetchall())
+            
+            slot.last_used = time.time()
+            logger.debug('Query returned %d rows', len(rows))
+            return columns, rows
+    
+    @_retry_on_disconnect
+    def execute_query_iter(
+        self,
+        query: str,
+        params: Optional[Tuple] = None
+    ) -> RowStream:
+        """
+        Execute a SELECT query and stream its rows instead of fetching them all.
+        
+        Runs on an unbuffered SSDictCursor: the statement executes here (so
+        errors and the reconnect-once retry happen before any row is read),
+        then rows come off the socket one at a time as the stream is iterated.
+        The pool slot is only released once the stream is drained or closed,
+        so callers must always do one or the other.
+        
+        Args:
+            query: SQL query with %s placeholders
+            params: Tuple of parameters to substitute
+            
+        Returns:
+            RowStream of result dictionaries
+            
+        Raises:
+            Exception: If query fails
+        """
+        with ExitStack() as stack:
+            slot = stack.enter_context(self._checkout(read_only=True))
+            conn = self._get_connection(slot)
+            cursor = stack.enter_context(conn.cursor(pymysql.cursors.SSDictCursor))
+            
+            logger.debug('Executing streamed query: %.100s...', query, params_count=len(params) if params else 0)
+            
+            cursor.execute(query, params)
+            
+            # Success: hand the cursor and slot over to the stream
+            return RowStream(cursor, slot, stack.pop_all())
+    
+    def execute_queries(
+        self,
+        queries: List[Tuple[str, Optional[Tuple]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Execute independent SELECT queries concurrently on pooled connections.
+        
+        Wall time is the slowest query instead of the sum of round-trips.
+        Each query keeps execute_query's reconnect-once behaviour.
+        
+        Args:
+            queries: List of (query, params) pairs
+            
+        Returns:
+            Result lists in the same order as queries
+            
+        Raises:
+            Exception: If any query fails
+        """
+        if len(queries) == 1:
+            query, params = queries[0]
+            return [self.execute_query(query, params)]
+        
+        futures = [
+            self._executor.submit(self.execute_query, query, params)
+            for query, params in queries
+        ]
+        return [future.result() for future in futures]
+    
     def execute_insert(
         self,
         query: str,
@@ -164,15 +498,47 @@ class DatabaseClient:
         Raises:
             Exception: If insert fails
         """
-        with self._get_cursor() as cursor:
-            logger.debug(f'Executing insert: {query[:100]}...')
+        with self._get_write_cursor() as cursor:
+            logger.debug('Executing insert: %.100s...', query)
             
             cursor.execute(query, params)
             last_id = cursor.lastrowid
             
-            logger.info(f'Insert successful, ID: {last_id}')
+            logger.info('Insert successful, ID: %s', last_id)
             return last_id
     
+    def execute_insertmany(
+        self,
+        query: str,
+        params_list: List[Tuple]
+    ) -> int:
+        """
+        Execute a batched INSERT with parameterized rows.
+        
+        pymysql rewrites INSERT ... VALUES (...) into a single multi-row
+        statement, so N rows cost one round-trip and one server-side parse.
+        Batches past pymysql's max_stmt_length (1,024,000 bytes) are split into
+        several statements; they all run in the write connection's single
+        transaction (autocommit is off) and commit together.
+        
+        Args:
+            query: SQL INSERT query with %s placeholders
+            params_list: List of parameter tuples, one per row
+            
+        Returns:
+            Number of inserted rows
+            
+        Raises:
+            Exception: If insert fails (the whole batch is rolled back)
+        """
+        with self._get_write_cursor() as cursor:
+            logger.debug('Executing batch insert: %.100s...', query, rows=len(params_list))
+            
+            inserted = cursor.executemany(query, params_list)
+            
+            logger.info('Batch insert successful, rows: %s', inserted)
+            return inserted
+    
     def execute_update(
         self,
         query: str,
@@ -191,24 +557,26 @@ class DatabaseClient:
         Raises:
             Exception: If update fails
         """
-        with self._get_cursor() as cursor:
-            logger.debug(f'Executing update: {query[:100]}...')
+        with self._get_write_cursor() as cursor:
+            logger.debug('Executing update: %.100s...', query)
             
             affected = cursor.execute(query, params)
             
-            logger.info(f'Update affected {affected} rows')
+            logger.info('Update affected %s rows', affected)
             return affected
     
     def close(self):
-        """Close database connection"""
-        if self._connection:
-            try:
-                self._connection.close()
-                logger.info('Database connection closed')
-            except:
-                pass
-            finally:
-                self._connection = None
+        """Close all idle pooled database connections"""
+        for pool in (self._pool, self._ro_pool):
+            slots = []
+            while True:
+                try:
+                    slots.append(pool.get_nowait())
+                except queue.Empty:
+                    break
+            for slot in slots:
+                slot.reset()
+                pool.put(slot)
 
 
 # Global database client instance (reused across Lambda invocations)
@@ -244,13 +612,76 @@ CREATE TABLE access_logs (
     user_agent VARCHAR(500),
     department VARCHAR(100),
     user_id VARCHAR(100),
+    -- SQL injection tooling in user_agent (case-insensitive collation), computed
+    -- and stored by the database for every writer
+    is_suspicious_agent TINYINT AS
+        (IFNULL(user_agent LIKE '%sqlmap%' OR user_agent LIKE '%curl%', 0)) PERSISTENT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_timestamp (timestamp),
+    -- Covers get_access_logs (fields=compact): every selected column lives in the index
+    INDEX idx_ts_cover (timestamp, ip_address, method, endpoint, http_version,
+                        status_code, response_size, response_time_ms),
     INDEX idx_ip (ip_address),
-    INDEX idx_status (status_code),
-    INDEX idx_endpoint (endpoint(100))
+    -- Brute force detection: WHERE status_code = 401 GROUP BY ip_address
+    INDEX idx_status_ip (status_code, ip_address),
+    INDEX idx_endpoint (endpoint(100)),
+    INDEX idx_suspicious_agent (is_suspicious_agent, timestamp),
+    -- Performance metrics: WHERE response_time_ms > ? GROUP BY endpoint
+    INDEX idx_rt_endpoint (response_time_ms, endpoint)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Migrating an existing access_logs table (if is_suspicious_agent already exists
+-- as a plain column, first: ALTER TABLE access_logs DROP COLUMN is_suspicious_agent;)
+ALTER TABLE access_logs
+    -- Computed for existing rows as the column is added
+    ADD COLUMN is_suspicious_agent TINYINT AS
+        (IFNULL(user_agent LIKE '%sqlmap%' OR user_agent LIKE '%curl%', 0)) PERSISTENT AFTER user_id,
+    ADD INDEX idx_suspicious_agent (is_suspicious_agent, timestamp),
+    ADD INDEX idx_ts_cover (timestamp, ip_address, method, endpoint, http_version,
+                            status_code, response_size, response_time_ms),
+    ADD INDEX idx_status_ip (status_code, ip_address),
+    ADD INDEX idx_rt_endpoint (response_time_ms, endpoint),
+    DROP INDEX idx_timestamp,
+    DROP INDEX idx_status;
+ALTER TABLE error_logs
+    ADD INDEX idx_severity_ts (severity_score, timestamp),
+    DROP INDEX idx_severity;
+
+-- 5-minute traffic rollup read by get_traffic_summary, kept current by the trigger below
+CREATE TABLE traffic_rollup_5m (
+    bucket DATETIME NOT NULL,
+    endpoint VARCHAR(500) NOT NULL,
+    ip_address VARCHAR(45) NOT NULL,
+    cnt INT NOT NULL DEFAULT 0,
+    error_cnt INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (bucket, endpoint, ip_address)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Cutover (run in one session): the trigger counts every row inserted after it
+-- exists, the backfill every row up to @rollup_cutoff. Reading the cutoff and
+-- creating the trigger under a write lock makes the switch atomic - no insert
+-- can land between the two, so no row is lost or counted twice
+LOCK TABLES access_logs WRITE;
+SELECT COALESCE(MAX(id), 0) INTO @rollup_cutoff FROM access_logs;
+
+CREATE TRIGGER trg_access_logs_rollup AFTER INSERT ON access_logs
+FOR EACH ROW
+    INSERT INTO traffic_rollup_5m (bucket, endpoint, ip_address, cnt, error_cnt)
+    VALUES (FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(NEW.timestamp) / 300) * 300),
+            NEW.endpoint, NEW.ip_address, 1, NEW.status_code >= 400)
+    ON DUPLICATE KEY UPDATE cnt = cnt + 1, error_cnt = error_cnt + VALUES(error_cnt);
+
+UNLOCK TABLES;
+
+-- Backfill the rows that predate the trigger (a no-op on a new database); adds
+-- to buckets the trigger has already started filling since the cutover
+INSERT INTO traffic_rollup_5m (bucket, endpoint, ip_address, cnt, error_cnt)
+SELECT FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(timestamp) / 300) * 300),
+       endpoint, ip_address, COUNT(*), SUM(status_code >= 400)
+FROM access_logs
+WHERE id <= @rollup_cutoff
+GROUP BY 1, 2, 3
+ON DUPLICATE KEY UPDATE cnt = cnt + VALUES(cnt), error_cnt = error_cnt + VALUES(error_cnt);
+
 CREATE TABLE error_logs (
     id BIGINT AUTO_INCREMENT PRIMARY KEY,
     timestamp DATETIME NOT NULL,
@@ -266,7 +697,8 @@ CREATE TABLE error_logs (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_timestamp (timestamp),
     INDEX idx_level (log_level),
-    INDEX idx_severity (severity_score),
+    -- Anomalies: WHERE severity_score >= ? ORDER BY severity_score DESC, timestamp DESC
+    INDEX idx_severity_ts (severity_score, timestamp),
     INDEX idx_error_code (error_code)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 """
\ No newline at end of file
@@ -11,81 +11,319 @@ Security Notes:
 - Errors are caught and logged, never exposed to client
 """
 
-from typing import Any, Dict, List, Optional
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from config import Config
 from db_client import get_db_client
 from logger import get_logger
-from validators import validate_limit, validate_timestamp, validate_ip_address, validate_status_code
+from validators import validate_limit
 
 logger = get_logger()
 
 
+# SQL templates
+# Module-level constants so every call sends the exact same statement text
+# ({where_clause}/{joiner} are rendered once per filter combination at import,
+# values are always %s params)
+
+# Column lists for get_access_logs; the compact list is exactly what
+# idx_ts_cover holds, so those queries never touch the clustered index
+_ACCESS_LOG_COLUMNS = """id, timestamp, ip_address, method, endpoint,
+        http_version, status_code, response_size,
+        response_time_ms, user_agent, department, user_id"""
+
+_ACCESS_LOG_COMPACT_COLUMNS = """id, timestamp, ip_address, method, endpoint,
+        http_version, status_code, response_size,
+        response_time_ms"""
+
+_SQL_GET_ACCESS_LOGS = """
+    SELECT 
+        {columns}
+    FROM access_logs
+    {where_clause}
+    ORDER BY timestamp DESC
+    LIMIT %s
+"""
+
+_SQL_GET_ERROR_LOGS = """
+    SELECT 
+        id, timestamp, log_level, process_id, thread_id,
+        client_ip, error_code, error_message, file_path,
+        line_number, severity_score
+    FROM error_logs
+    {where_clause}
+    ORDER BY timestamp DESC, severity_score DESC
+    LIMIT %s
+"""
+
+_SQL_INSERT_ACCESS_LOG = """
+    INSERT INTO access_logs (
+        timestamp, ip_address, method, endpoint, http_version,
+        status_code, response_size, response_time_ms, user_agent,
+        department, user_id
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+_SQL_INSERT_ERROR_LOG = """
+    INSERT INTO error_logs (
+        timestamp, log_level, process_id, thread_id, client_ip,
+        error_code, error_message, file_path, line_number, severity_score
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# Traffic summary reads the 5-minute rollup (traffic_rollup_5m) instead of
+# scanning access_logs. Both time bounds are rounded inward to whole buckets:
+# only buckets lying entirely within [start_time, end_time] are counted
+# (start rounded up to a bucket boundary, last bucket must end by end_time)
+_SQL_ROLLUP_FIRST_BUCKET = 'FROM_UNIXTIME(CEIL(UNIX_TIMESTAMP(%s) / 300) * 300)'
+_SQL_ROLLUP_LAST_BUCKET = 'DATE_SUB(%s, INTERVAL 299 SECOND)'
+
+# Total, error count and error rate (percent, 2 dp) in one scan; SUM()/ROUND()
+# return DECIMAL, cast so the values serialize as JSON numbers
+_SQL_TRAFFIC_TOTALS = """
+    SELECT
+        CAST(COALESCE(SUM(cnt), 0) AS UNSIGNED) as total_requests,
+        CAST(COALESCE(SUM(error_cnt), 0) AS UNSIGNED) as error_count,
+        CAST(COALESCE(ROUND(100 * SUM(error_cnt) / NULLIF(SUM(cnt), 0), 2), 0) AS DOUBLE) as error_rate
+    FROM traffic_rollup_5m
+    {where_clause}
+"""
+
+# Top endpoints and top IPs in one round-trip, each built by the server as a JSON map
+_SQL_TRAFFIC_TOP = """
+    SELECT
+        (SELECT JSON_OBJECTAGG(endpoint, count)
+         FROM (SELECT endpoint, SUM(cnt) as count
+               FROM traffic_rollup_5m
+               {where_clause}
+               GROUP BY endpoint
+               ORDER BY count DESC
+               LIMIT 10) ranked) as top_endpoints,
+        (SELECT JSON_OBJECTAGG(ip_address, count)
+         FROM (SELECT ip_address, SUM(cnt) as count
+               FROM traffic_rollup_5m
+               {where_clause}
+               GROUP BY ip_address
+               ORDER BY count DESC
+               LIMIT 10) ranked) as top_ips
+"""
+
+# Brute force IPs and suspicious user agents in one round-trip, tagged by kind
+# (read positionally: kind, ip_address, user_agent, endpoint, failures).
+# is_suspicious_agent is a generated column the database computes from
+# user_agent, so detection is an index lookup, not a LIKE scan
+_SQL_SECURITY_THREATS = """
+    (SELECT 'brute_force' as kind, ip_address, NULL as user_agent,
+            NULL as endpoint, COUNT(*) as failures
+     FROM access_logs
+     {where_clause} {joiner} status_code = 401
+     GROUP BY ip_address
+     HAVING failures >= 3)
+    UNION ALL
+    (SELECT 'sql_injection' as kind, ip_address, user_agent,
+            endpoint, NULL as failures
+     FROM access_logs
+     {where_clause} {joiner} is_suspicious_agent = 1)
+"""
+
+# Rows are returned as-is, so rounding and severity are computed here
+_SQL_PERFORMANCE_METRICS = """
+    SELECT 
+        endpoint,
+        CAST(ROUND(AVG(response_time_ms), 2) AS DOUBLE) as avg_response_time_ms,
+        MAX(response_time_ms) as peak_response_time_ms,
+        COUNT(*) as request_count,
+        CASE WHEN MAX(response_time_ms) > 3000 THEN 'HIGH' ELSE 'MEDIUM' END as severity
+    FROM access_logs
+    {where_clause}
+    GROUP BY endpoint
+    ORDER BY peak_response_time_ms DESC
+    LIMIT 20
+"""
+
+# Read positionally by handle_get_anomalies - keep the column order in sync
+_SQL_ANOMALIES = """
+    SELECT 
+        timestamp, error_code, error_message, severity_score,
+        client_ip, file_path
+    FROM error_logs
+    {where_clause}
+    ORDER BY severity_score DESC, timestamp DESC
+    LIMIT 50
+"""
+
+
+# Optional filters per handler: (param name, condition, bind function).
+# Conditions are always emitted in this order, so the bound values follow it too.
+_Filter = Tuple[str, str, Callable[[Any], Any]]
+
+# Always-bound trailing params: (param name, default, bind function)
+_Param = Tuple[str, Any, Callable[[Any], Any]]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_TIME_FILTERS = (
+    ('start_time', 'timestamp >= %s', _identity),
+    ('end_time', 'timestamp <= %s', _identity),
+)
+
+_ACCESS_LOG_FILTERS = (
+    ('ip_address', 'ip_address = %s', _identity),
+    ('status_code', 'status_code = %s', _identity),
+    ('start_time', 'timestamp >= %s', _identity),
+    ('end_time', 'timestamp <= %s', _identity),
+    ('endpoint', 'endpoint LIKE %s', lambda value: f'%{value}%'),
+)
+
+_ERROR_LOG_FILTERS = (
+    ('log_level', 'log_level = %s', _identity),
+    ('severity_score', 'severity_score >= %s', int),
+    ('start_time', 'timestamp >= %s', _identity),
+    ('end_time', 'timestamp <= %s', _identity),
+    ('error_code', 'error_code = %s', _identity),
+)
+
+_TRAFFIC_FILTERS = (
+    ('start_time', 'bucket >= ' + _SQL_ROLLUP_FIRST_BUCKET, _identity),
+    ('end_time', 'bucket <= ' + _SQL_ROLLUP_LAST_BUCKET, _identity),
+)
+
+
+def _build_templates(
+    sql: str,
+    filters: Tuple[_Filter, ...],
+    fixed_conditions: Tuple[str, ...] = (),
+    **fragments: str
+) -> Dict[FrozenSet[str], str]:
+    """
+    Render a SQL template once for every subset of its optional filters.
+    
+    Args:
+        sql: Template with {where_clause} (and optionally {joiner}) placeholders
+        filters: Optional filters that may be active
+        fixed_conditions: Conditions always appended after the active filters
+        fragments: Other fixed placeholders (e.g. {columns})
+        
+    Returns:
+        Final SQL text keyed by the frozenset of active filter names
+    """
+    templates = {}
+    for size in range(len(filters) + 1):
+        for subset in combinations(filters, size):
+            conditions = [condition for _, condition, _ in subset] + list(fixed_conditions)
+            where_clause = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
+            joiner = 'AND' if conditions else 'WHERE'
+            key = frozenset(name for name, _, _ in subset)
+            templates[key] = sql.format(where_clause=where_clause, joiner=joiner, **fragments)
+    return templates
+
+
+def _bind_filters(
+    params: Dict[str, Any],
+    filters: Tuple[_Filter, ...]
+) -> Tuple[FrozenSet[str], List[Any]]:
+    """Return the active filter names (template key) and their bound values in order"""
+    active = [(name, bind) for name, _, bind in filters if params.get(name)]
+    return frozenset(name for name, _ in active), [bind(params[name]) for name, bind in active]
+
+
+def _bind_limit(limit: Any) -> int:
+    """Validated row limit, falling back to the default of 100"""
+    is_valid, limit_val, _ = validate_limit(limit)
+    return limit_val if is_valid else 100
+
+
+@dataclass(frozen=True)
+class _QuerySpec:
+    """
+    One query shape: pre-rendered SQL per filter combination plus binding order.
+    
+    Values bind as the active filters (repeated `repeat` times for templates
+    that apply the WHERE clause in several branches), then the trailing params.
+    """
+    filters: Tuple[_Filter, ...]
+    templates: Dict[FrozenSet[str], str]
+    trailing: Tuple[_Param, ...] = ()
+    repeat: int = 1
+    
+    def bind(self, params: Dict[str, Any]) -> Tuple[str, Tuple]:
+        """Return the query text and its parameter tuple for a request's params"""
+        active, values = _bind_filters(params, self.filters)
+        values = values * self.repeat
+        values.extend(bind(params.get(name, default)) for name, default, bind in self.trailing)
+        return self.templates[active], tuple(values)
+
+
+def _query_spec(
+    sql: str,
+    filters: Tuple[_Filter, ...],
+    fixed_conditions: Tuple[str, ...] = (),
+    trailing: Tuple[_Param, ...] = (),
+    repeat: int = 1,
+    **fragments: str
+) -> _QuerySpec:
+    """Build a _QuerySpec, pre-rendering its templates (see _build_templates)"""
+    templates = _build_templates(sql, filters, fixed_conditions, **fragments)
+    return _QuerySpec(filters, templates, trailing, repeat)
+
+
+_LIMIT_PARAM = (('limit', 100, _bind_limit),)
+
+_ACCESS_LOG_SPEC = _query_spec(
+    _SQL_GET_ACCESS_LOGS, _ACCESS_LOG_FILTERS,
+    trailing=_LIMIT_PARAM, columns=_ACCESS_LOG_COLUMNS
+)
+_ACCESS_LOG_COMPACT_SPEC = _query_spec(
+    _SQL_GET_ACCESS_LOGS, _ACCESS_LOG_FILTERS,
+    trailing=_LIMIT_PARAM, columns=_ACCESS_LOG_COMPACT_COLUMNS
+)
+_ERROR_LOG_SPEC = _query_spec(_SQL_GET_ERROR_LOGS, _ERROR_LOG_FILTERS, trailing=_LIMIT_PARAM)
+_TRAFFIC_TOTALS_SPEC = _query_spec(_SQL_TRAFFIC_TOTALS, _TRAFFIC_FILTERS)
+_TRAFFIC_TOP_SPEC = _query_spec(_SQL_TRAFFIC_TOP, _TRAFFIC_FILTERS, repeat=2)
+_SECURITY_THREATS_SPEC = _query_spec(_SQL_SECURITY_THREATS, _TIME_FILTERS, repeat=2)
+_PERFORMANCE_METRICS_SPEC = _query_spec(
+    _SQL_PERFORMANCE_METRICS, _TIME_FILTERS, ('response_time_ms > %s',),
+    trailing=(('threshold_ms', 1000, _identity),)
+)
+_ANOMALIES_SPEC = _query_spec(
+    _SQL_ANOMALIES, _TIME_FILTERS, ('severity_score >= %s',),
+    trailing=(('min_severity', 8, _identity),)
+)
+
 def handle_get_access_logs(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Retrieve access logs with optional filters.
     
     Args:
-        params: Query parameters (ip_address, status_code, start_time, end_time, limit)
+        params: Query parameters (ip_address, status_code, start_time, end_time, limit,
+            fields - 'compact' omits user_agent/department/user_id)
         
     Returns:
-        Dictionary with 'success' flag and 'data' or 'error'
+        Dictionary with 'success' flag and 'data' or 'error'. data['logs'] is a
+        db_client.RowStream; lambda_function encodes it row by row and adds 'count'
     """
     try:
         db = get_db_client()
         
-        # Build parameterized query
-        conditions = []
-        query_params = []
-        
-        # Optional filters
-        if 'ip_address' in params and params['ip_address']:
-            conditions.append('ip_address = %s')
-            query_params.append(params['ip_address'])
-        
-        if 'status_code' in params and params['status_code']:
-            conditions.append('status_code = %s')
-            query_params.append(params['status_code'])
-        
-        if 'start_time' in params and params['start_time']:
-            conditions.append('timestamp >= %s')
-            query_params.append(params['start_time'])
-        
-        if 'end_time' in params and params['end_time']:
-            conditions.append('timestamp <= %s')
-            query_params.append(params['end_time'])
-        
-        if 'endpoint' in params and params['endpoint']:
-            conditions.append('endpoint LIKE %s')
-            query_params.append(f"%{params['endpoint']}%")
-        
-        # Build WHERE clause
-        where_clause = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
-        
-        # Get limit
-        limit = params.get('limit', 100)
-        is_valid, limit_val, _ = validate_limit(limit)
-        if not is_valid:
-            limit_val = 100
-        
-        # Execute query
-        query = f"""
-            SELECT 
-                id, timestamp, ip_address, method, endpoint, 
-                http_version, status_code, response_size, 
-                response_time_ms, user_agent, department, user_id
-            FROM access_logs
-            {where_clause}
-            ORDER BY timestamp DESC
-            LIMIT %s
-        """
-        query_params.append(limit_val)
-        
-        results = db.execute_query(query, tuple(query_params))
+        # Optional filters select a pre-rendered query
+        spec = _ACCESS_LOG_COMPACT_SPEC if params.get('fields') == 'compact' else _ACCESS_LOG_SPEC
+        query, query_params = spec.bind(params)
+        
+        # LIMIT can be large: rows stay on the socket until the response is encoded
+        rows = db.execute_query_iter(query, query_params)
         
         return {
             'success': True,
             'data': {
-                'logs': results,
-                'count': len(results)
+                'logs': rows
             }
         }
     
@@ -105,60 +343,21 @@ def handle_get_error_logs(params: Dict[str, Any]) -> Dict[str, Any]:
         params: Query parameters (log_level, severity_score, start_time, end_time, limit)
         
     Returns:
-        Dictionary with 'success' flag and 'data' or 'error'
+        Dictionary with 'success' flag and 'data' or 'error'. data['logs'] is a
+        db_client.RowStream; lambda_function encodes it row by row and adds 'count'
     """
     try:
         db = get_db_client()
         
-        conditions = []
-        query_params = []
-        
-        if 'log_level' in params and params['log_level']:
-            conditions.append('log_level = %s')
-            query_params.append(params['log_level'])
-        
-        if 'severity_score' in params and params['severity_score']:
-            conditions.append('severity_score >= %s')
-            query_params.append(int(params['severity_score']))
-        
-        if 'start_time' in params and params['start_time']:
-            conditions.append('timestamp >= %s')
-            query_params.append(params['start_time'])
-        
-        if 'end_time' in params and params['end_time']:
-            conditions.append('timestamp <= %s')
-            query_params.append(params['end_time'])
-        
-        if 'error_code' in params and params['error_code']:
-            conditions.append('error_code = %s')
-            query_params.append(params['error_code'])
+        query, query_params = _ERROR_LOG_SPEC.bind(params)
         
-        where_clause = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
-        
-        limit = params.get('limit', 100)
-        is_valid, limit_val, _ = validate_limit(limit)
-        if not is_valid:
-            limit_val = 100
-        
-        query = f"""
-            SELECT 
-                id, timestamp, log_level, process_id, thread_id,
-                client_ip, error_code, error_message, file_path,
-                line_number, severity_score
-            FROM error_logs
-            {where_clause}
-            ORDER BY timestamp DESC, severity_score DESC
-            LIMIT %s
-        """
-        query_params.append(limit_val)
-        
-        results = db.execute_query(query, tuple(query_params))
+        # LIMIT can be large: rows stay on the socket until the response is encoded
+        rows = db.execute_query_iter(query, query_params)
         
         return {
             'success': True,
             'data': {
-                'logs': results,
-                'count': len(results)
+                'logs': rows
             }
         }
     
@@ -170,6 +369,23 @@ def handle_get_error_logs(params: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def _access_log_row(params: Dict[str, Any]) -> tuple:
+    """Map access log fields to _SQL_INSERT_ACCESS_LOG parameter order"""
+    return (
+        params['timestamp'],
+        params['ip_address'],
+        params['method'],
+        params['endpoint'],
+        params.get('http_version'),
+        params['status_code'],
+        params.get('response_size'),
+        params.get('response_time_ms'),
+        params.get('user_agent'),
+        params.get('department'),
+        params.get('user_id')
+    )
+
+
 def handle_store_access_log(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Store a new access log entry.
@@ -183,29 +399,7 @@ def handle_store_access_log(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         db = get_db_client()
         
-        query = """
-            INSERT INTO access_logs (
-                timestamp, ip_address, method, endpoint, http_version,
-                status_code, response_size, response_time_ms, user_agent,
-                department, user_id
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        query_params = (
-            params['timestamp'],
-            params['ip_address'],
-            params['method'],
-            params['endpoint'],
-            params.get('http_version'),
-            params['status_code'],
-            params.get('response_size'),
-            params.get('response_time_ms'),
-            params.get('user_agent'),
-            params.get('department'),
-            params.get('user_id')
-        )
-        
-        log_id = db.execute_insert(query, query_params)
+        log_id = db.execute_insert(_SQL_INSERT_ACCESS_LOG, _access_log_row(params))
         
         return {
             'success': True,
@@ -223,6 +417,38 @@ def handle_store_access_log(params: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def handle_store_access_logs_batch(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Store many access log entries in one multi-row INSERT.
+    
+    Args:
+        params: 'logs' - list of access log field dicts (same fields as store_access_log)
+        
+    Returns:
+        Dictionary with 'success' flag and 'data' or 'error'
+    """
+    try:
+        db = get_db_client()
+        
+        rows = [_access_log_row(log) for log in params['logs']]
+        inserted = db.execute_insertmany(_SQL_INSERT_ACCESS_LOG, rows)
+        
+        return {
+            'success': True,
+            'data': {
+                'count': inserted,
+                'message': 'Access logs stored successfully'
+            }
+        }
+    
+    except Exception as e:
+        logger.error('Error in store_access_logs_batch', error=e)
+        return {
+            'success': False,
+            'error': 'Failed to store access logs'
+        }
+
+
 def handle_store_error_log(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Store a new error log entry.
@@ -236,13 +462,6 @@ def handle_store_error_log(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         db = get_db_client()
         
-        query = """
-            INSERT INTO error_logs (
-                timestamp, log_level, process_id, thread_id, client_ip,
-                error_code, error_message, file_path, line_number, severity_score
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
         query_params = (
             params['timestamp'],
             params['log_level'],
@@ -256,7 +475,7 @@ def handle_store_error_log(params: Dict[str, Any]) -> Dict[str, Any]:
             params.get('severity_score', 5)
         )
         
-        log_id = db.execute_insert(query, query_params)
+        log_id = db.execute_insert(_SQL_INSERT_ERROR_LOG, query_params)
         
         return {
             'success': True,
@@ -274,6 +493,14 @@ def handle_store_error_log(params: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def _top_counts(top_json: Optional[str]) -> Dict[str, int]:
+    """Decode a JSON_OBJECTAGG map (NULL when no rows), highest count first"""
+    if not top_json:
+        return {}
+    counts = json.loads(top_json)
+    return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+
 def handle_get_traffic_summary(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Get aggregated traffic statistics.
@@ -287,64 +514,26 @@ def handle_get_traffic_summary(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         db = get_db_client()
         
-        conditions = []
-        query_params = []
-        
-        if 'start_time' in params and params['start_time']:
-            conditions.append('timestamp >= %s')
-            query_params.append(params['start_time'])
-        
-        if 'end_time' in params and params['end_time']:
-            conditions.append('timestamp <= %s')
-            query_params.append(params['end_time'])
-        
-        where_clause = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
-        
-        # Total requests
-        total_query = f"SELECT COUNT(*) as total FROM access_logs {where_clause}"
-        total_result = db.execute_query(total_query, tuple(query_params))
-        total_requests = total_result[0]['total'] if total_result else 0
-        
-        # Error rate
-        error_query = f"""
-            SELECT COUNT(*) as errors 
-            FROM access_logs 
-            {where_clause} {'AND' if conditions else 'WHERE'} status_code >= 400
-        """
-        error_result = db.execute_query(error_query, tuple(query_params))
-        error_count = error_result[0]['errors'] if error_result else 0
-        error_rate = (error_count / total_requests * 100) if total_requests > 0 else 0
-        
-        # Top endpoints
-        top_endpoints_query = f"""
-            SELECT endpoint, COUNT(*) as count
-            FROM access_logs
-            {where_clause}
-            GROUP BY endpoint
-            ORDER BY count DESC
-            LIMIT 10
-        """
-        top_endpoints = db.execute_query(top_endpoints_query, tuple(query_params))
-        
-        # Top IPs
-        top_ips_query = f"""
-            SELECT ip_address, COUNT(*) as count
-            FROM access_logs
-            {where_clause}
-            GROUP BY ip_address
-            ORDER BY count DESC
-            LIMIT 10
-        """
-        top_ips = db.execute_query(top_ips_query, tuple(query_params))
+        # Totals and top endpoints/IPs are independent - run them concurrently
+        totals_result, top_results = db.execute_queries([
+            _TRAFFIC_TOTALS_SPEC.bind(params),
+            _TRAFFIC_TOP_SPEC.bind(params)
+        ])
+        
+        summary = totals_result[0] if totals_result else {
+            'total_requests': 0, 'error_count': 0, 'error_rate': 0.0
+        }
+        
+        top_row = top_results[0] if top_results else {}
+        top_endpoints = _top_counts(top_row.get('top_endpoints'))
+        top_ips = _top_counts(top_row.get('top_ips'))
         
         return {
             'success': True,
             'data': {
-                'total_requests': total_requests,
-                'error_count': error_count,
-                'error_rate': round(error_rate, 2),
-                'top_endpoints': {row['endpoint']: row['count'] for row in top_endpoints},
-                'top_ips': {row['ip_address']: row['count'] for row in top_ips}
+                **summary,
+                'top_endpoints': top_endpoints,
+                'top_ips': top_ips
             }
         }
     
@@ -369,58 +558,32 @@ def handle_get_security_threats(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         db = get_db_client()
         
-        conditions = []
-        query_params = []
-        
-        if 'start_time' in params and params['start_time']:
-            conditions.append('timestamp >= %s')
-            query_params.append(params['start_time'])
-        
-        if 'end_time' in params and params['end_time']:
-            conditions.append('timestamp <= %s')
-            query_params.append(params['end_time'])
-        
-        where_clause = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
-        
-        threats = []
-        
-        # Brute force detection (multiple 401s from same IP)
-        brute_force_query = f"""
-            SELECT ip_address, COUNT(*) as failures
-            FROM access_logs
-            {where_clause} {'AND' if conditions else 'WHERE'} status_code = 401
-            GROUP BY ip_address
-            HAVING failures >= 3
-        """
-        brute_results = db.execute_query(brute_force_query, tuple(query_params))
-        
-        for row in brute_results:
-            threats.append({
-                'severity': 'HIGH',
-                'type': 'Brute Force Attack',
-                'details': f"{row['failures']} failed login attempts from IP {row['ip_address']}",
-                'ip_address': row['ip_address'],
-                'count': row['failures']
-            })
-        
-        # SQL injection detection (suspicious user agents)
-        sql_injection_query = f"""
-            SELECT ip_address, user_agent, endpoint
-            FROM access_logs
-            {where_clause} {'AND' if conditions else 'WHERE'} 
-            (user_agent LIKE %s OR user_agent LIKE %s)
-        """
-        sql_params = list(query_params) + ['%sqlmap%', '%curl%']
-        sql_results = db.execute_query(sql_injection_query, tuple(sql_params))
-        
-        for row in sql_results:
-            threats.append({
-                'severity': 'MEDIUM',
-                'type': 'SQL Injection Attempt',
-                'details': f"Suspicious tool detected: {row['user_agent']} from {row['ip_address']}",
-                'ip_address': row['ip_address'],
-                'endpoint': row['endpoint']
-            })
+        threats_query, query_params = _SECURITY_THREATS_SPEC.bind(params)
+        _, rows = db.execute_query_rows(threats_query, query_params)
+        
+        # Brute force threats are listed before SQL injection attempts
+        brute_force = []
+        sql_injection = []
+        for kind, ip_address, user_agent, endpoint, failures in rows:
+            if kind == 'brute_force':
+                # Brute force detection (multiple 401s from same IP)
+                brute_force.append({
+                    'severity': 'HIGH',
+                    'type': 'Brute Force Attack',
+                    'details': f"{failures} failed login attempts from IP {ip_address}",
+                    'ip_address': ip_address,
+                    'count': failures
+                })
+            else:
+                # SQL injection detection (suspicious user agents)
+                sql_injection.append({
+                    'severity': 'MEDIUM',
+                    'type': 'SQL Injection Attempt',
+                    'details': f"Suspicious tool detected: {user_agent} from {ip_address}",
+                    'ip_address': ip_address,
+                    'endpoint': endpoint
+                })
+        threats = brute_force + sql_injection
         
         return {
             'success': True,
@@ -451,47 +614,9 @@ def handle_get_performance_metrics(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         db = get_db_client()
         
-        conditions = []
-        query_params = []
-        
-        if 'start_time' in params and params['start_time']:
-            conditions.append('timestamp >= %s')
-            query_params.append(params['start_time'])
-        
-        if 'end_time' in params and params['end_time']:
-            conditions.append('timestamp <= %s')
-            query_params.append(params['end_time'])
-        
-        threshold = params.get('threshold_ms', 1000)
-        conditions.append('response_time_ms > %s')
-        query_params.append(threshold)
-        
-        where_clause = 'WHERE ' + ' AND '.join(conditions)
-        
-        query = f"""
-            SELECT 
-                endpoint,
-                AVG(response_time_ms) as avg_response_time,
-                MAX(response_time_ms) as peak_response_time,
-                COUNT(*) as request_count
-            FROM access_logs
-            {where_clause}
-            GROUP BY endpoint
-            ORDER BY peak_response_time DESC
-            LIMIT 20
-        """
-        
-        results = db.execute_query(query, tuple(query_params))
-        
-        issues = []
-        for row in results:
-            issues.append({
-                'endpoint': row['endpoint'],
-                'avg_response_time_ms': round(row['avg_response_time'], 2),
-                'peak_response_time_ms': row['peak_response_time'],
-                'request_count': row['request_count'],
-                'severity': 'HIGH' if row['peak_response_time'] > 3000 else 'MEDIUM'
-            })
+        query, query_params = _PERFORMANCE_METRICS_SPEC.bind(params)
+        
+        issues = db.execute_query(query, query_params)
         
         return {
             'success': True,
@@ -522,45 +647,20 @@ def handle_get_anomalies(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         db = get_db_client()
         
-        conditions = []
-        query_params = []
-        
-        if 'start_time' in params and params['start_time']:
-            conditions.append('timestamp >= %s')
-            query_params.append(params['start_time'])
-        
-        if 'end_time' in params and params['end_time']:
-            conditions.append('timestamp <= %s')
-            query_params.append(params['end_time'])
-        
-        min_severity = params.get('min_severity', 8)
-        conditions.append('severity_score >= %s')
-        query_params.append(min_severity)
-        
-        where_clause = 'WHERE ' + ' AND '.join(conditions)
+        query, query_params = _ANOMALIES_SPEC.bind(params)
         
-        query = f"""
-            SELECT 
-                timestamp, error_code, error_message, severity_score,
-                client_ip, file_path
-            FROM error_logs
-            {where_clause}
-            ORDER BY severity_score DESC, timestamp DESC
-            LIMIT 50
-        """
-        
-        results = db.execute_query(query, tuple(query_params))
+        _, rows = db.execute_query_rows(query, query_params)
         
         anomalies = []
-        for row in results:
+        for timestamp, error_code, error_message, severity_score, client_ip, file_path in rows:
             anomalies.append({
-                'timestamp': str(row['timestamp']),
-                'error_code': row['error_code'],
-                'error_message': row['error_message'],
-                'severity_score': row['severity_score'],
-                'severity': 'CRITICAL' if row['severity_score'] >= 9 else 'HIGH',
-                'client_ip': row['client_ip'],
-                'file_path': row['file_path']
+                'timestamp': str(timestamp),
+                'error_code': error_code,
+                'error_message': error_message,
+                'severity_score': severity_score,
+                'severity': 'CRITICAL' if severity_score >= 9 else 'HIGH',
+                'client_ip': client_ip,
+                'file_path': file_path
             })
         
         return {
@@ -584,6 +684,7 @@ INTENT_HANDLERS = {
     'get_access_logs': handle_get_access_logs,
     'get_error_logs': handle_get_error_logs,
     'store_access_log': handle_store_access_log,
+    'store_access_logs_batch': handle_store_access_logs_batch,
     'store_error_log': handle_store_error_log,
     'get_traffic_summary': handle_get_traffic_summary,
     'get_security_threats': handle_get_security_threats,
@@ -592,13 +693,63 @@ INTENT_HANDLERS = {
 }
 
 
+# Aggregate read intents whose results are cached per warm container (TTL seconds);
+# dashboards poll these with the same time range
+_RESULT_CACHE_TTL = {
+    'get_traffic_summary': 30,
+    'get_security_threats': 30,
+    'get_performance_metrics': 60,
+    'get_anomalies': 10,
+}
+
+# Write intents that clear the result cache when RESULT_CACHE_CLEAR_ON_WRITE is set
+_WRITE_INTENTS = {'store_access_log', 'store_access_logs_batch', 'store_error_log'}
+
+# LRU of (intent, params json) -> (expires_at, result)
+_result_cache: 'OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]' = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _cache_get(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    """Return a cached, unexpired result and mark it most recently used"""
+    with _result_cache_lock:
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del _result_cache[key]
+            return None
+        _result_cache.move_to_end(key)
+        return result
+
+
+def _cache_put(key: Tuple[str, str], result: Dict[str, Any], ttl: float):
+    """Store a result, evicting the least recently used entry when full"""
+    with _result_cache_lock:
+        _result_cache[key] = (time.monotonic() + ttl, result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > Config.RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def clear_result_cache():
+    """Drop all cached read results"""
+    with _result_cache_lock:
+        _result_cache.clear()
+
+
 def execute_intent(intent: str, params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute intent handler.
     
+    Successful results of aggregate read intents are served from an in-process
+    TTL cache; write intents clear it (see RESULT_CACHE_CLEAR_ON_WRITE).
+    
     Args:
         intent: Intent name (must be whitelisted)
-        params: Intent parameters
+        params: Intent parameters, already validated and converted by
+            validators.validate_request
         
     Returns:
         Result dictionary from intent handler
@@ -611,4 +762,19 @@ def execute_intent(intent: str, params: Dict[str, Any]) -> Dict[str, Any]:
             'error': f'No handler for intent: {intent}'
         }
     
-    return handler(params)
\ No newline at end of file
+    ttl = _RESULT_CACHE_TTL.get(intent)
+    if ttl is None or Config.RESULT_CACHE_SIZE <= 0:
+        result = handler(params)
+        if intent in _WRITE_INTENTS and Config.RESULT_CACHE_CLEAR_ON_WRITE and result.get('success'):
+            clear_result_cache()
+        return result
+    
+    key = (intent, json.dumps(params, sort_keys=True, default=str))
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    
+    result = handler(params)
+    if result.get('success') is True:
+        _cache_put(key, result, ttl)
+    return result
\ No newline at end of file
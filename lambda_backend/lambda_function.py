@@ -19,18 +19,89 @@ Error Handling:
 - Detailed errors logged internally
 """
 
+import base64
+import functools
 import json
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from auth import authenticate_request
+from db_client import RowStream
 from validators import validate_request
 from intents import execute_intent
 from logger import get_logger
 from config import Config
 
+# orjson serializes response bodies several times faster than the stdlib (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes go through default=str like json.dumps, keeping 'YYYY-MM-DD HH:MM:SS'
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+)
+
 logger = get_logger()
 
 
+def _validate_config() -> Optional[ValueError]:
+    """Validate configuration once at cold start; returns the error, if any"""
+    try:
+        Config.validate()
+        return None
+    except ValueError as e:
+        logger.critical('Configuration validation failed', error=e)
+        return e
+
+
+# Checked on every request, computed once per container
+_CONFIG_ERROR: Optional[ValueError] = _validate_config()
+
+
+# Security headers sent with every response. Shared by all responses without
+# custom headers - read-only, never mutate it
+_DEFAULT_HEADERS: Dict[str, str] = {
+    'Content-Type': 'application/json',
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block',
+    'Strict-Transport-Security': 'max-age=31536000; includeSubDomains'
+}
+
+
+def _dumps(value: Any) -> str:
+    """Encode a value as JSON text"""
+    if orjson:
+        return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(value, default=str)  # default=str handles datetime serialization
+
+
+def _dumps_streamed(body: Dict[str, Any], key: str, rows: RowStream) -> str:
+    """
+    Encode a body whose data[key] is a RowStream, adding data['count'].
+    
+    Each row is encoded as it comes off the socket, so the body is built from
+    JSON text alone, never a list of every row dict. API Gateway's proxy
+    integration needs the whole body at once, so the text is still joined
+    before returning.
+    """
+    parts: List[str] = []
+    try:
+        for row in rows:
+            parts.append(_dumps(row))
+    finally:
+        rows.close()
+    
+    data = {name: value for name, value in body['data'].items() if name != key}
+    data['count'] = len(parts)
+    
+    # Row array spliced in as the first data field, data as the last body field
+    data_json = '{' + _dumps(key) + ':[' + ','.join(parts) + '],' + _dumps(data)[1:]
+    head = _dumps({name: value for name, value in body.items() if name != 'data'})
+    return head[:-1] + (',' if len(head) > 2 else '') + '"data":' + data_json + '}'
+
+
 def create_response(
     status_code: int,
     body: Dict[str, Any],
@@ -41,27 +112,57 @@ def create_response(
     
     Args:
         status_code: HTTP status code
-        body: Response body dictionary
+        body: Response body dictionary; a RowStream in body['data'] is encoded
+            as a JSON array followed by data['count']
         headers: Optional custom headers
         
     Returns:
         API Gateway response dictionary
     """
-    default_headers = {
-        'Content-Type': 'application/json',
-        'X-Content-Type-Options': 'nosniff',
-        'X-Frame-Options': 'DENY',
-        'X-XSS-Protection': '1; mode=block',
-        'Strict-Transport-Security': 'max-age=31536000; includeSubDomains'
+    response_headers = {**_DEFAULT_HEADERS, **headers} if headers else _DEFAULT_HEADERS
+    
+    data = body.get('data')
+    stream_key = next(
+        (name for name, value in data.items() if isinstance(value, RowStream)), None
+    ) if isinstance(data, dict) else None
+    
+    if stream_key is not None:
+        body_json = _dumps_streamed(body, stream_key, data[stream_key])
+    else:
+        body_json = _dumps(body)
+    
+    return {
+        'statusCode': status_code,
+        'headers': response_headers,
+        'body': body_json
     }
+
+
+@functools.lru_cache(maxsize=64)
+def _error_body_prefix(error: str) -> str:
+    """JSON error body up to the request_id value; each message is escaped once"""
+    return '{"error":' + json.dumps(error) + ',"request_id":"'
+
+
+def create_error_response(status_code: int, error: str, request_id: str) -> Dict[str, Any]:
+    """
+    Create an API Gateway error response ({"error": ..., "request_id": ...}).
     
-    if headers:
-        default_headers.update(headers)
+    Fast path for the handler's error branches: the body is assembled from a
+    cached, pre-escaped prefix instead of serializing a dict per response.
     
+    Args:
+        status_code: HTTP status code
+        error: Client-safe error message
+        request_id: Request ID (UUID, needs no escaping)
+        
+    Returns:
+        API Gateway response dictionary
+    """
     return {
         'statusCode': status_code,
-        'headers': default_headers,
-        'body': json.dumps(body, default=str)  # default=str handles datetime serialization
+        'headers': _DEFAULT_HEADERS,
+        'body': _error_body_prefix(error) + request_id + '"}'
     }
 
 
@@ -78,31 +179,31 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         API Gateway response dictionary
     """
-    # Generate unique request ID for tracing
-    request_id = str(uuid.uuid4())
+    # Generate unique request ID for tracing (32-char hex UUID, no hyphens)
+    request_id = uuid.uuid4().hex
     
     try:
-        # Validate configuration at cold start
-        try:
-            Config.validate()
-        except ValueError as e:
-            logger.critical('Configuration validation failed', error=e)
-            return create_response(
-                500,
-                {'error': 'Server configuration error', 'request_id': request_id}
-            )
+        # Configuration was validated at cold start
+        if _CONFIG_ERROR is not None:
+            return create_error_response(500, 'Server configuration error', request_id)
         
         # Extract request components
         headers = event.get('headers', {}) or {}
-        body_str = event.get('body', '') or '{}'
+        body = event.get('body', '') or '{}'
         http_method = event.get('httpMethod', 'POST')
         
-        # Extract caller IP (from API Gateway)
-        caller_ip = (
-            headers.get('X-Forwarded-For', '').split(',')[0].strip() or
-            headers.get('X-Real-Ip', '') or
-            event.get('requestContext', {}).get('identity', {}).get('sourceIp', '')
-        )
+        # Extract caller IP (from API Gateway): first X-Forwarded-For hop, sliced
+        # without splitting the whole header
+        caller_ip = ''
+        forwarded_for = headers.get('X-Forwarded-For')
+        if forwarded_for:
+            comma = forwarded_for.find(',')
+            caller_ip = (forwarded_for if comma == -1 else forwarded_for[:comma]).strip()
+        if not caller_ip:
+            caller_ip = (
+                headers.get('X-Real-Ip', '') or
+                event.get('requestContext', {}).get('identity', {}).get('sourceIp', '')
+            )
         
         # Log incoming request
         logger.log_request(
@@ -120,10 +221,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 request_id=request_id,
                 caller_ip=caller_ip
             )
-            return create_response(
-                401,
-                {'error': auth_error, 'request_id': request_id}
-            )
+            return create_error_response(401, auth_error, request_id)
         
         # 2. HTTP Method validation (only POST allowed for security)
         if http_method != 'POST':
@@ -132,23 +230,25 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 request_id=request_id,
                 http_method=http_method
             )
-            return create_response(
-                405,
-                {'error': 'Method not allowed. Use POST.', 'request_id': request_id}
-            )
+            return create_error_response(405, 'Method not allowed. Use POST.', request_id)
+        
+        # Binary bodies are validated as the decoded bytes (no str round trip)
+        if event.get('isBase64Encoded'):
+            try:
+                body = base64.b64decode(body)
+            except ValueError:
+                logger.warning('Invalid base64 request body', request_id=request_id)
+                return create_error_response(400, 'Invalid base64-encoded body', request_id)
         
         # 3. VALIDATION: Validate request body
-        is_valid, data, validation_error = validate_request(body_str)
+        is_valid, data, validation_error = validate_request(body)
         if not is_valid:
             logger.warning(
                 'Request validation failed',
                 request_id=request_id,
                 error=validation_error
             )
-            return create_response(
-                400,
-                {'error': validation_error, 'request_id': request_id}
-            )
+            return create_error_response(400, validation_error, request_id)
         
         # Extract intent and parameters
         intent = data.get('intent')
@@ -169,6 +269,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             # Determine status code based on result
             status_code = 200 if result.get('success', False) else 500
             
+            # Return response with request_id for tracing; encoded before the
+            # response is logged, since streamed rows are read from the DB here
+            response_body = {
+                'request_id': request_id,
+                **result
+            }
+            response = create_response(status_code, response_body)
+            
             # Log response
             logger.log_response(
                 request_id=request_id,
@@ -176,13 +284,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 intent=intent
             )
             
-            # Return response with request_id for tracing
-            response_body = {
-                'request_id': request_id,
-                **result
-            }
-            
-            return create_response(status_code, response_body)
+            return response
         
         except Exception as e:
             # Internal error - log but don't expose details
@@ -193,13 +295,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 intent=intent
             )
             
-            return create_response(
-                500,
-                {
-                    'error': 'Internal server error',
-                    'request_id': request_id
-                }
-            )
+            return create_error_response(500, 'Internal server error', request_id)
     
     except Exception as e:
         # Unexpected error - log but return generic message
@@ -209,10 +305,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             request_id=request_id
         )
         
-        return create_response(
-            500,
-            {
-                'error': 'Internal server error',
-                'request_id': request_id
-            }
-        )
\ No newline at end of file
+        return create_error_response(500, 'Internal server error', request_id)
+    
+    finally:
+        # Write out this invocation's buffered log lines in one go
+        logger.flush()
@@ -11,31 +11,95 @@ Security Notes:
 - Log levels: DEBUG, INFO, WARNING, ERROR, CRITICAL
 """
 
+import atexit
 import json
 import logging
+import re
 import sys
-from datetime import datetime
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import Any, Dict, List, Optional
 import traceback
+from config import Config
+
+# orjson encodes log lines several times faster than the stdlib (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Keys whose values are never logged (substring match, case-insensitive):
+# password/db_password, api_key/x-api-key, authorization, token, secret, credential
+_SENSITIVE_KEY_PATTERN = re.compile(
+    r'password|api_key|x-api-key|authorization|token|secret|credential', re.IGNORECASE
+)
+
+# Method level -> (logging level number, name written to the 'level' field)
+_LOG_LEVELS = {
+    'debug': (logging.DEBUG, 'DEBUG'),
+    'info': (logging.INFO, 'INFO'),
+    'warning': (logging.WARNING, 'WARNING'),
+    'error': (logging.ERROR, 'ERROR'),
+    'critical': (logging.CRITICAL, 'CRITICAL'),
+}
+
+# Buffered log lines are written out once this many are pending
+_BUFFER_LIMIT = 64
+
+# Longer string values are truncated by _sanitize
+_MAX_STRING_LENGTH = 1000
+
+# (epoch second, 'YYYY-MM-DDTHH:MM:SS') - the date/time part is formatted at most
+# once per second, log lines only add the microseconds
+_timestamp_prefix = (-1, '')
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO 8601 with microseconds, e.g. 2025-01-06T08:15:23.123456Z"""
+    global _timestamp_prefix
+    now = time.time()
+    second = int(now)
+    cached = _timestamp_prefix
+    if cached[0] != second:
+        cached = (second, time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second)))
+        _timestamp_prefix = cached
+    return f'{cached[1]}.{int((now - second) * 1000000):06d}Z'
+
+
+def _is_plain(*values: Any) -> bool:
+    """True if every value is None or a string short enough to skip _sanitize"""
+    return all(
+        value is None or (type(value) is str and len(value) <= _MAX_STRING_LENGTH)
+        for value in values
+    )
+
+
+def _json_value(value: Optional[str]) -> str:
+    """JSON literal for a plain log value (escaped string or null)"""
+    return 'null' if value is None else json.dumps(value)
 
 
 class StructuredLogger:
     """
     JSON-structured logger for CloudWatch Logs.
     Outputs one JSON object per log line for easy querying.
+    
+    Lines are buffered and written to stdout in one call by flush(), which
+    lambda_handler runs at the end of every invocation. Errors flush
+    immediately so they are never lost with a crashed invocation.
     """
     
     def __init__(self, name: str = 'lambda_backend', level: str = 'INFO'):
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+        self.name = name
+        self._level = getattr(logging, level.upper(), logging.INFO)
         
-        # Remove default handlers
-        self.logger.handlers = []
+        self._stream = sys.stdout
+        self._buffer: List[str] = []
+        self._buffer_lock = threading.Lock()
         
-        # Add JSON formatter handler
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(JsonFormatter())
-        self.logger.addHandler(handler)
+        # Don't drop lines still buffered when the process exits
+        atexit.register(self.flush)
     
     def _sanitize(self, data: Any) -> Any:
         """
@@ -50,60 +114,91 @@ class StructuredLogger:
         """
         if isinstance(data, dict):
             sanitized = {}
-            sensitive_keys = [
-                'password', 'api_key', 'x-api-key', 'authorization',
-                'token', 'secret', 'credential', 'db_password'
-            ]
             
             for key, value in data.items():
-                key_lower = key.lower()
-                if any(sensitive in key_lower for sensitive in sensitive_keys):
+                if _SENSITIVE_KEY_PATTERN.search(key):
                     sanitized[key] = '***REDACTED***'
-                else:
+                elif isinstance(value, (dict, list, str)):
                     sanitized[key] = self._sanitize(value)
+                else:
+                    # Numbers, booleans, None: nothing to redact or truncate
+                    sanitized[key] = value
             return sanitized
         
         elif isinstance(data, list):
             return [self._sanitize(item) for item in data]
         
-        elif isinstance(data, str) and len(data) > 1000:
+        elif isinstance(data, str) and len(data) > _MAX_STRING_LENGTH:
             # Truncate very long strings
-            return data[:1000] + '... [TRUNCATED]'
+            return data[:_MAX_STRING_LENGTH] + '... [TRUNCATED]'
         
         return data
     
-    def _log(self, level: str, message: str, **kwargs):
+    def _log(self, level: str, message: str, *args, **kwargs):
         """
         Internal logging method with structured data.
         
+        Disabled levels return before any formatting, sanitizing or JSON
+        encoding; %-style args are only interpolated for emitted records.
+        
         Args:
             level: Log level (debug, info, warning, error, critical)
-            message: Log message
+            message: Log message (may contain %-style placeholders)
+            *args: Values for the message placeholders
             **kwargs: Additional structured fields
         """
+        levelno, level_name = _LOG_LEVELS.get(level, _LOG_LEVELS['info'])
+        if levelno < self._level:
+            return
+        
         log_data = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
-            'level': level.upper(),
-            'message': message,
-            **self._sanitize(kwargs)
+            'timestamp': _utc_timestamp(),
+            'level': level_name,
+            'message': message % args if args else message
         }
+        if kwargs:
+            log_data.update(self._sanitize(kwargs))
         
-        log_method = getattr(self.logger, level.lower(), self.logger.info)
-        log_method(json.dumps(log_data))
+        self._write(orjson.dumps(log_data).decode() if orjson else json.dumps(log_data), levelno)
     
-    def debug(self, message: str, **kwargs):
+    def _write(self, line: str, levelno: int):
+        """Buffer one serialized log line, flushing when full or on errors"""
+        with self._buffer_lock:
+            self._buffer.append(line)
+            pending = len(self._buffer)
+        
+        if pending >= _BUFFER_LIMIT or levelno >= logging.ERROR:
+            self.flush()
+    
+    def flush(self):
+        """Write all buffered log lines to stdout in a single call"""
+        with self._buffer_lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+        
+        self._stream.write('\n'.join(lines) + '\n')
+        self._stream.flush()
+    
+    def debug(self, message: str, *args, **kwargs):
         """Log debug message"""
-        self._log('debug', message, **kwargs)
+        self._log('debug', message, *args, **kwargs)
     
-    def info(self, message: str, **kwargs):
+    def info(self, message: str, *args, **kwargs):
         """Log info message"""
-        self._log('info', message, **kwargs)
+        self._log('info', message, *args, **kwargs)
     
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message"""
-        self._log('warning', message, **kwargs)
+        self._log('warning', message, *args, **kwargs)
     
-    def error(self, message: str, error: Optional[Exception] = None, **kwargs):
+    def error(
+        self,
+        message: str,
+        error: Optional[Exception] = None,
+        capture_stack: bool = True,
+        **kwargs
+    ):
         """
         Log error message with optional exception.
         Stack traces are logged internally but never sent to client.
@@ -111,6 +206,8 @@ class StructuredLogger:
         Args:
             message: Error message
             error: Optional exception object
+            capture_stack: Include the formatted traceback; pass False when the
+                exception is re-raised and logged with its stack further up
             **kwargs: Additional context
         """
         log_data = kwargs.copy()
@@ -118,14 +215,15 @@ class StructuredLogger:
         if error:
             log_data['error_type'] = type(error).__name__
             log_data['error_message'] = str(error)
-            # Include stack trace for internal debugging
-            log_data['stack_trace'] = traceback.format_exc()
+            if capture_stack:
+                # Include stack trace for internal debugging
+                log_data['stack_trace'] = traceback.format_exc()
         
         self._log('error', message, **log_data)
     
     def critical(self, message: str, error: Optional[Exception] = None, **kwargs):
-        """Log critical error"""
-        self.error(message, error, **kwargs)
+        """Log critical error (always with the stack trace)"""
+        self.error(message, error, capture_stack=True, **kwargs)
     
     def log_request(self, request_id: str, intent: str, caller_ip: Optional[str] = None, **kwargs):
         """
@@ -137,6 +235,23 @@ class StructuredLogger:
             caller_ip: Client IP address (if available)
             **kwargs: Additional request context
         """
+        # Fast path for the handler's call shape: the line is built directly,
+        # values are JSON-escaped (caller_ip comes from client headers)
+        if kwargs.keys() == {'http_method'} and _is_plain(
+            request_id, intent, caller_ip, kwargs['http_method']
+        ):
+            if logging.INFO >= self._level:
+                self._write(
+                    f'{{"timestamp":"{_utc_timestamp()}","level":"INFO",'
+                    f'"message":"API request received",'
+                    f'"request_id":{_json_value(request_id)},'
+                    f'"intent":{_json_value(intent)},'
+                    f'"caller_ip":{_json_value(caller_ip)},'
+                    f'"http_method":{_json_value(kwargs["http_method"])}}}',
+                    logging.INFO
+                )
+            return
+        
         self.info(
             'API request received',
             request_id=request_id,
@@ -155,6 +270,19 @@ class StructuredLogger:
             intent: Intent name
             **kwargs: Additional response context
         """
+        # Fast path without extra fields, see log_request
+        if not kwargs and type(status_code) is int and _is_plain(request_id, intent):
+            if logging.INFO >= self._level:
+                self._write(
+                    f'{{"timestamp":"{_utc_timestamp()}","level":"INFO",'
+                    f'"message":"API response sent",'
+                    f'"request_id":{_json_value(request_id)},'
+                    f'"status_code":{status_code},'
+                    f'"intent":{_json_value(intent)}}}',
+                    logging.INFO
+                )
+            return
+        
         self.info(
             'API response sent',
             request_id=request_id,
@@ -164,30 +292,16 @@ class StructuredLogger:
         )
 
 
-class JsonFormatter(logging.Formatter):
-    """Custom formatter that outputs JSON"""
-    
-    def format(self, record):
-        # If message is already JSON, return as-is
-        if isinstance(record.msg, str) and record.msg.startswith('{'):
-            return record.msg
-        return super().format(record)
-
-
-# Global logger instance
-_logger: Optional[StructuredLogger] = None
+# Global logger instance, created once at cold start (reused across Lambda invocations)
+_logger: StructuredLogger = StructuredLogger(level=Config.LOG_LEVEL)
 
 
 def get_logger() -> StructuredLogger:
     """
-    Get or create global logger instance.
+    Get the global logger instance.
     Singleton pattern for Lambda reuse.
     
     Returns:
         StructuredLogger instance
     """
-    global _logger
-    if _logger is None:
-        from config import Config
-        _logger = StructuredLogger(level=Config.LOG_LEVEL)
     return _logger
\ No newline at end of file
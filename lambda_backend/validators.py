@@ -12,27 +12,49 @@ Security Notes:
 - SQL injection prevention via parameterized queries (enforced in db_client)
 """
 
+import ipaddress
 import json
-from typing import Any, Dict, List, Optional, Tuple
+import re
+import socket
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from logger import get_logger
 from config import Config
 
+# orjson parses request bodies 2-3x faster than the stdlib (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger()
 
 
 # Whitelist of allowed intents
 # Only these intents can be executed - all others are rejected
-ALLOWED_INTENTS = {
+ALLOWED_INTENTS = frozenset({
     'get_access_logs',
     'get_error_logs',
     'store_access_log',
+    'store_access_logs_batch',
     'store_error_log',
     'get_traffic_summary',
     'get_security_threats',
     'get_performance_metrics',
     'get_anomalies',
     'query_logs',  # Generic query endpoint
-}
+})
+
+# Listed in the unknown-intent error message
+_SORTED_INTENTS = sorted(ALLOWED_INTENTS)
+
+# 'YYYY-MM-DD', 'YYYY-MM-DD HH:MM[:SS[.ffffff]]' or ISO 8601 with 'T' and an
+# optional Z / +HH:MM offset (DATETIME columns take no offset, see validate_timestamp)
+_TIMESTAMP_PATTERN = re.compile(
+    r'\d{4}-\d{2}-\d{2}'
+    r'(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?P<offset>Z|[+-]\d{2}:?\d{2})?)?'
+)
 
 
 def validate_intent(intent: str) -> Tuple[bool, Optional[str]]:
@@ -51,45 +73,53 @@ def validate_intent(intent: str) -> Tuple[bool, Optional[str]]:
         return False, 'Intent is required'
     
     if intent not in ALLOWED_INTENTS:
-        logger.warning(f'Rejected unknown intent: {intent}')
-        return False, f'Unknown intent: {intent}. Allowed intents: {sorted(ALLOWED_INTENTS)}'
+        logger.warning('Rejected unknown intent: %s', intent)
+        return False, f'Unknown intent: {intent}. Allowed intents: {_SORTED_INTENTS}'
     
     return True, None
 
 
-def validate_payload_size(body: str) -> Tuple[bool, Optional[str]]:
+def validate_payload_size(body: Union[str, bytes]) -> Tuple[bool, Optional[str]]:
     """
     Validate request payload size.
     
     Args:
-        body: Request body string
+        body: Request body string or raw bytes
         
     Returns:
         Tuple of (is_valid, error_message)
     """
-    size = len(body.encode('utf-8'))
     max_size = Config.MAX_PAYLOAD_SIZE
     
+    # Byte length without encoding a copy: ASCII is 1 byte per char and UTF-8
+    # is at most 4, so only non-ASCII bodies near the limit get encoded
+    if isinstance(body, bytes) or body.isascii():
+        size = len(body)
+    elif len(body) * 4 <= max_size:
+        return True, None
+    else:
+        size = len(body.encode('utf-8'))
+    
     if size > max_size:
         return False, f'Payload too large: {size} bytes (max: {max_size} bytes)'
     
     return True, None
 
 
-def validate_json(body: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
+def validate_json(body: Union[str, bytes]) -> Tuple[bool, Optional[Dict], Optional[str]]:
     """
     Validate and parse JSON body.
     
     Args:
-        body: Request body string
+        body: Request body string or raw UTF-8 bytes
         
     Returns:
         Tuple of (is_valid, parsed_json, error_message)
     """
     try:
-        data = json.loads(body)
+        data = orjson.loads(body) if orjson else json.loads(body)
         return True, data, None
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         return False, None, f'Invalid JSON: {str(e)}'
 
 
@@ -129,7 +159,8 @@ def validate_timestamp(timestamp: Any) -> Tuple[bool, Optional[str], Optional[st
         timestamp: Timestamp string
         
     Returns:
-        Tuple of (is_valid, parsed_timestamp, error_message)
+        Tuple of (is_valid, parsed_timestamp, error_message); timestamps with a
+        Z / +HH:MM offset are converted to naive UTC 'YYYY-MM-DD HH:MM:SS'
     """
     if timestamp is None:
         return True, None, None
@@ -137,12 +168,29 @@ def validate_timestamp(timestamp: Any) -> Tuple[bool, Optional[str], Optional[st
     if not isinstance(timestamp, str):
         return False, None, 'Timestamp must be a string'
     
-    # Basic ISO 8601 format check (YYYY-MM-DD HH:MM:SS or ISO format)
-    # In production, use dateutil.parser for strict validation
-    if len(timestamp) < 10:
+    # Format check only (YYYY-MM-DD HH:MM:SS or ISO format); field ranges such
+    # as month 13 are left to the database
+    match = _TIMESTAMP_PATTERN.fullmatch(timestamp)
+    if match is None:
         return False, None, 'Invalid timestamp format'
     
-    return True, timestamp, None
+    offset = match.group('offset')
+    if offset is None:
+        return True, timestamp, None
+    
+    # MariaDB DATETIME rejects offsets in strict mode: convert to naive UTC
+    local = timestamp[:match.start('offset')].replace('T', ' ')
+    fmt = '%Y-%m-%d %H:%M:%S' if local.count(':') == 2 else '%Y-%m-%d %H:%M'
+    try:
+        parsed = datetime.strptime(local, fmt + '.%f' if '.' in local else fmt)
+    except ValueError:
+        return False, None, 'Invalid timestamp format'
+    
+    if offset != 'Z':
+        sign = -1 if offset[0] == '-' else 1
+        parsed -= sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[-2:]))
+    
+    return True, parsed.isoformat(sep=' '), None
 
 
 def validate_ip_address(ip: Any) -> Tuple[bool, Optional[str], Optional[str]]:
@@ -161,19 +209,20 @@ def validate_ip_address(ip: Any) -> Tuple[bool, Optional[str], Optional[str]]:
     if not isinstance(ip, str):
         return False, None, 'IP address must be a string'
     
-    # Basic IP validation (IPv4)
-    # In production, use ipaddress module for strict validation
-    parts = ip.split('.')
-    if len(parts) != 4:
+    # Dotted-quad IPv4 is parsed in C by inet_pton (strict: no short, hex or
+    # octal forms); IPv6 is the fallback. 45 chars is the ip_address column width
+    if len(ip) > 45:
         return False, None, 'Invalid IP address format'
     
     try:
-        for part in parts:
-            num = int(part)
-            if not (0 <= num <= 255):
-                return False, None, 'Invalid IP address range'
-    except ValueError:
-        return False, None, 'IP address must contain numbers'
+        socket.inet_pton(socket.AF_INET, ip)
+    except OSError:
+        if ':' not in ip:
+            return False, None, 'Invalid IP address format'
+        try:
+            ipaddress.IPv6Address(ip)
+        except ValueError:
+            return False, None, 'Invalid IP address format'
     
     return True, ip, None
 
@@ -200,100 +249,215 @@ def validate_status_code(status_code: Any) -> Tuple[bool, Optional[int], Optiona
         return False, None, 'Status code must be an integer'
 
 
-def validate_intent_params(intent: str, params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+def validate_int_range(
+    value: Any,
+    minimum: int,
+    maximum: Optional[int] = None,
+    name: str = 'Value'
+) -> Tuple[bool, Optional[int], Optional[str]]:
     """
-    Validate parameters for specific intent.
+    Validate an integer parameter within bounds.
     
     Args:
-        intent: Intent name
-        params: Parameters dictionary
+        value: Value (may be int or string)
+        minimum: Smallest allowed value
+        maximum: Largest allowed value (None for no upper bound)
+        name: Parameter name for the error message
         
     Returns:
-        Tuple of (is_valid, error_message)
+        Tuple of (is_valid, parsed_int, error_message)
     """
-    # Validate common parameters
-    if 'limit' in params:
-        is_valid, _, error = validate_limit(params['limit'])
-        if not is_valid:
-            return False, error
+    if value is None:
+        return True, None, None
     
-    # Intent-specific validation
-    if intent == 'get_access_logs':
-        # Optional filters
-        if 'ip_address' in params:
-            is_valid, _, error = validate_ip_address(params['ip_address'])
-            if not is_valid:
-                return False, error
-        
-        if 'status_code' in params:
-            is_valid, _, error = validate_status_code(params['status_code'])
-            if not is_valid:
-                return False, error
-        
-        if 'start_time' in params:
-            is_valid, _, error = validate_timestamp(params['start_time'])
-            if not is_valid:
-                return False, error
-        
-        if 'end_time' in params:
-            is_valid, _, error = validate_timestamp(params['end_time'])
+    try:
+        number = int(value)
+    except (ValueError, TypeError):
+        return False, None, f'{name} must be an integer'
+    
+    if number < minimum:
+        if maximum is None:
+            return False, None, f'{name} must be at least {minimum}'
+        return False, None, f'{name} must be between {minimum} and {maximum}'
+    
+    if maximum is not None and number > maximum:
+        return False, None, f'{name} must be between {minimum} and {maximum}'
+    
+    return True, number, None
+
+
+def _validate_fields(fields: Any) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Validate the get_access_logs column set ('full' or 'compact')"""
+    if fields not in ('full', 'compact'):
+        return False, None, "fields must be 'full' or 'compact'"
+    return True, fields, None
+
+
+# Signature shared by the per-field validators above: value -> (is_valid, parsed, error)
+_FieldValidator = Callable[[Any], Tuple[bool, Any, Optional[str]]]
+
+
+@dataclass(frozen=True)
+class _ParamRules:
+    """
+    Parameter rules for one intent.
+    
+    Attributes:
+        required: Fields that must be present
+        fields: (field, validator) pairs, checked when the field is present
+        check: Optional validator for the whole params dict, run last
+    """
+    required: Tuple[str, ...] = ()
+    fields: Tuple[Tuple[str, _FieldValidator], ...] = ()
+    check: Optional[Callable[[Dict[str, Any]], Tuple[bool, Optional[str]]]] = None
+
+
+def _check_params(rules: _ParamRules, params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    """
+    Apply one intent's rules to its params; returns (is_valid, error_message).
+    
+    Validated fields are replaced in place by their parsed values (e.g.
+    status_code '404' becomes 404), so handlers and cache keys see canonical params.
+    """
+    for field in rules.required:
+        if field not in params:
+            return False, f'Missing required field: {field}'
+    
+    for field, validator in rules.fields:
+        if field in params:
+            is_valid, value, error = validator(params[field])
             if not is_valid:
                 return False, error
+            params[field] = value
     
-    elif intent == 'store_access_log':
-        # Required fields
-        required = ['timestamp', 'ip_address', 'method', 'endpoint', 'status_code']
-        for field in required:
-            if field not in params:
-                return False, f'Missing required field: {field}'
-        
-        # Validate types
-        is_valid, _, error = validate_timestamp(params['timestamp'])
-        if not is_valid:
-            return False, error
-        
-        is_valid, _, error = validate_ip_address(params['ip_address'])
-        if not is_valid:
-            return False, error
-        
-        is_valid, _, error = validate_status_code(params['status_code'])
-        if not is_valid:
-            return False, error
-    
-    elif intent == 'store_error_log':
-        # Required fields
-        required = ['timestamp', 'log_level', 'error_code', 'error_message']
-        for field in required:
-            if field not in params:
-                return False, f'Missing required field: {field}'
+    if rules.check is not None:
+        return rules.check(params)
+    
+    return True, None
+
+
+# Checked for every intent before its own rules
+_COMMON_RULES = _ParamRules(fields=(('limit', validate_limit),))
+
+_ACCESS_LOG_ENTRY_RULES = _ParamRules(
+    required=('timestamp', 'ip_address', 'method', 'endpoint', 'status_code'),
+    fields=(
+        ('timestamp', validate_timestamp),
+        ('ip_address', validate_ip_address),
+        ('status_code', validate_status_code),
+    )
+)
+
+
+def validate_access_log_entry(params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    """
+    Validate a single access log entry (store_access_log and batch items).
+    
+    Args:
+        params: Access log fields
         
-        is_valid, _, error = validate_timestamp(params['timestamp'])
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    return _check_params(_ACCESS_LOG_ENTRY_RULES, params)
+
+
+def _validate_access_log_batch(params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    """Validate store_access_logs_batch params: a bounded, non-empty list of entries"""
+    logs = params.get('logs')
+    if not isinstance(logs, list) or not logs:
+        return False, 'logs must be a non-empty list'
+    
+    if len(logs) > Config.MAX_BATCH_SIZE:
+        return False, f'Batch exceeds maximum: {Config.MAX_BATCH_SIZE} logs'
+    
+    for index, log in enumerate(logs):
+        if not isinstance(log, dict):
+            return False, f'logs[{index}] must be an object'
+        is_valid, error = _check_params(_ACCESS_LOG_ENTRY_RULES, log)
         if not is_valid:
-            return False, error
+            return False, f'logs[{index}]: {error}'
     
-    elif intent == 'get_traffic_summary':
-        # Optional time range
-        if 'start_time' in params:
-            is_valid, _, error = validate_timestamp(params['start_time'])
-            if not is_valid:
-                return False, error
+    return True, None
+
+
+# Optional time window accepted by every read intent
+_TIME_RANGE_FIELDS = (
+    ('start_time', validate_timestamp),
+    ('end_time', validate_timestamp),
+)
+
+
+def _severity(name: str) -> _FieldValidator:
+    """Validator for a 1-10 severity parameter"""
+    return lambda value: validate_int_range(value, 1, 10, name)
+
+
+# Intent -> parameter rules; intents not listed only get the common checks
+_INTENT_PARAM_RULES: Dict[str, _ParamRules] = {
+    'get_access_logs': _ParamRules(
+        fields=_TIME_RANGE_FIELDS + (
+            ('ip_address', validate_ip_address),
+            ('status_code', validate_status_code),
+            ('fields', _validate_fields),
+        )
+    ),
+    'get_error_logs': _ParamRules(
+        fields=_TIME_RANGE_FIELDS + (('severity_score', _severity('severity_score')),)
+    ),
+    'store_access_log': _ACCESS_LOG_ENTRY_RULES,
+    'store_access_logs_batch': _ParamRules(check=_validate_access_log_batch),
+    'store_error_log': _ParamRules(
+        required=('timestamp', 'log_level', 'error_code', 'error_message'),
+        fields=(('timestamp', validate_timestamp),)
+    ),
+    'get_traffic_summary': _ParamRules(fields=_TIME_RANGE_FIELDS),
+    'get_security_threats': _ParamRules(fields=_TIME_RANGE_FIELDS),
+    'get_performance_metrics': _ParamRules(
+        fields=_TIME_RANGE_FIELDS + (
+            ('threshold_ms', lambda value: validate_int_range(value, 0, None, 'threshold_ms')),
+        )
+    ),
+    'get_anomalies': _ParamRules(
+        fields=_TIME_RANGE_FIELDS + (('min_severity', _severity('min_severity')),)
+    ),
+}
+
+
+def validate_intent_params(intent: str, params: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+    """
+    Validate parameters for specific intent.
+    
+    Valid fields are converted in place (see _check_params); intents can use
+    params as-is once this passes.
+    
+    Args:
+        intent: Intent name
+        params: Parameters dictionary
         
-        if 'end_time' in params:
-            is_valid, _, error = validate_timestamp(params['end_time'])
-            if not is_valid:
-                return False, error
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not isinstance(params, dict):
+        return False, 'params must be an object'
     
-    # Add validation for other intents as needed
+    is_valid, error = _check_params(_COMMON_RULES, params)
+    if not is_valid:
+        return False, error
     
-    return True, None
+    rules = _INTENT_PARAM_RULES.get(intent)
+    if rules is None:
+        return True, None
+    
+    return _check_params(rules, params)
 
 
-def validate_request(body: str, intent: Optional[str] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
+def validate_request(body: Union[str, bytes], intent: Optional[str] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
     """
     Complete request validation pipeline.
     
     Args:
-        body: Request body string
+        body: Request body string or raw bytes
         intent: Optional intent name (if already extracted)
         
     Returns:
@@ -304,12 +468,19 @@ def validate_request(body: str, intent: Optional[str] = None) -> Tuple[bool, Opt
     if not is_valid:
         return False, None, error
     
+    # Bodies that never mention "intent" are rejected without being parsed
+    if not intent and ('"intent"' if isinstance(body, str) else b'"intent"') not in body:
+        return False, None, 'Intent is required'
+    
     # 2. Parse JSON
     is_valid, data, error = validate_json(body)
     if not is_valid:
         return False, None, error
     
-    # 3. Validate intent
+    if not isinstance(data, dict):
+        return False, None, 'Request body must be a JSON object'
+    
+    # 3. Validate intent (whitelist) before any parameter checks
     intent_to_check = intent or data.get('intent')
     is_valid, error = validate_intent(intent_to_check)
     if not is_valid:
@@ -3,10 +3,18 @@ from pydantic import BaseModel
 from typing import Optional
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+import functools
 import json
 from pathlib import Path
 
-app = FastAPI(title="Local Chatbot Backend")
+# Serialize responses with orjson when it is installed (optional)
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as ResponseClass
+except ImportError:
+    from fastapi.responses import JSONResponse as ResponseClass
+
+app = FastAPI(title="Local Chatbot Backend", default_response_class=ResponseClass)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,7 +30,9 @@ class QueryRequest(BaseModel):
     query: Optional[str] = None
 
 
+@functools.lru_cache(maxsize=1)
 def load_mock_events():
+    # Parsed once per process and shared by all requests (never mutate the result)
     # Try to load the TypeScript mock file as JSON-like data
     # Fallback to embedded list if file not found
     ts_path = Path(__file__).parent / "lib" / "mock-data.ts"
@@ -65,20 +75,26 @@ def load_mock_events():
     ]
 
 
+@functools.lru_cache(maxsize=1)
+def load_mock_preview():
+    # First few events, returned for free-text queries
+    return load_mock_events()[:3]
+
+
 @app.post("/query")
 async def query_endpoint(req: QueryRequest):
-    events = load_mock_events()
     if req.promptId == "security-threats":
         content = "Here are the recent high-severity security threats."
-        data = events
+        data = load_mock_events()
     elif req.query:
         content = f"Analyzed query: {req.query}"
-        data = events[:3]
+        data = load_mock_preview()
     else:
         content = "No query provided"
         data = []
 
-    return {"content": content, "data": data}
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return ResponseClass({"content": content, "data": data})
 
 
 if __name__ == "__main__":
@@ -3,15 +3,47 @@ import streamlit as st
 from appp import create_sample_data, LogAnalyzer
 
 
+@st.cache_data
+def load_sample_data():
+    # Parsed once; Streamlit hands each rerun its own copy of the frames
+    return create_sample_data()
+
+
+@st.cache_resource
+def get_analyzer():
+    # One shared analyzer across reruns and sessions, so its per-instance
+    # result cache also spares re-running the quick analyses on radio clicks
+    access_df, error_df = load_sample_data()
+    return LogAnalyzer(access_df, error_df)
+
+
+# Rows sent to the browser per log table; larger frames show a preview
+PREVIEW_ROWS = 500
+
+TIMESTAMP_COLUMN = st.column_config.DatetimeColumn("timestamp", format="YYYY-MM-DD HH:mm:ss")
+
+
+def show_log_table(df):
+    # Only the previewed rows are serialized for the frontend
+    st.dataframe(
+        df.head(PREVIEW_ROWS),
+        use_container_width=True,
+        hide_index=True,
+        column_config={"timestamp": TIMESTAMP_COLUMN},
+    )
+    if len(df) > PREVIEW_ROWS:
+        st.caption(f"Showing the first {PREVIEW_ROWS} of {len(df)} rows.")
+
+
 def main():
     st.set_page_config(page_title="Watermark Security Intelligence (Streamlit)", layout="wide")
 
     st.title("🛡️ Watermark Security Intelligence Dashboard")
     st.write("Analyze sample Apache logs, detect threats, and view summaries.")
 
-    # Load data and analyzer (same sample data as Gradio app)
-    access_df, error_df = create_sample_data()
-    analyzer = LogAnalyzer(access_df, error_df)
+    # Load data and analyzer (same sample data as Gradio app), cached across reruns
+    access_df, error_df = load_sample_data()
+    analyzer = get_analyzer()
 
     with st.sidebar:
         st.header("Groq Settings")
@@ -36,10 +68,10 @@ def main():
     tab1, tab2 = st.tabs(["Access Logs", "Error Logs"])
     with tab1:
         st.subheader("Access Logs")
-        st.dataframe(access_df)
+        show_log_table(access_df)
     with tab2:
         st.subheader("Error Logs")
-        st.dataframe(error_df)
+        show_log_table(error_df)
 
     st.markdown("---")
 